@@ -0,0 +1,86 @@
+from pathlib import Path
+import logging
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import coloredlogs
+import day01
+from day01 import main, main_multi, main_numpy, main_stream, read_distances, read_input
+
+coloredlogs.install(level='INFO')
+logger = logging.getLogger(__name__)
+
+# Keep the solvers quiet while timing
+logging.getLogger(day01.__name__).setLevel(logging.WARNING)
+
+
+def generate_log(filename: Path, amount: int) -> None:
+    """Writes a random instruction log
+
+    :param filename: filename to write
+    :type filename: Path
+    :param amount: amount of instructions
+    :type amount: int
+    """
+    random.seed(2025)
+    with open(filename, "w") as f:
+        f.write('\n'.join(random.choice('LR') + str(random.randint(1, 999)) for _ in range(amount)))
+
+
+def timed(label: str, amount: int, func, *args):
+    """Runs func, logs run time and instructions per second
+
+    :param label: name to log
+    :type label: str
+    :param amount: amount of instructions handled
+    :type amount: int
+    :return: whatever func returns
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    answer = f'  -> {result}' if isinstance(result, int) else ''
+    logger.info(f'{label:<24} {duration:8.3f} s {amount / duration / 1e6:8.2f} M instructions/s{answer}')
+    return result
+
+
+def bench_numpy(filename: Path, amount: int) -> None:
+    puzzle = timed('read_input', amount, read_input, filename)
+    for part in (1, 2):
+        timed(f'main part {part}', amount, main, puzzle, part)
+
+    distances = timed('read_distances', amount, read_distances, filename)
+    for part in (1, 2):
+        timed(f'main_numpy part {part}', amount, main_numpy, distances, part)
+
+
+def list_based(filename: Path, part: int) -> int:
+    return main(read_input(filename), part)
+
+
+def bench_streaming(filename: Path, amount: int) -> None:
+    for label, func in [('list based', list_based), ('streaming', main_stream)]:
+        tracemalloc.start()
+        timed(f'{label} part 2', amount, func, filename, 2)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        logger.info(f'{label:<24} peak memory {peak / 1e6:8.1f} MB')
+
+
+def bench_multi(filename: Path, amount: int) -> None:
+    timed('read + main_numpy part 2', amount, lambda: main_numpy(read_distances(filename), 2))
+    for processes in range(1, os.cpu_count() + 1):
+        timed(f'main_multi {processes} cores', amount, main_multi, filename, 2, processes)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    amount = 5_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = Path(tmp) / 'instructions.txt'
+        generate_log(filename, amount)
+
+        bench_numpy(filename, amount)
+        bench_streaming(filename, amount)
+        bench_multi(filename, amount)
@@ -1,6 +1,10 @@
 from pathlib import Path
+from functools import reduce
+import os
+import multiprocessing
 import logging
 import coloredlogs
+import numpy as np
 
 coloredlogs.install(level='INFO')
 logger = logging.getLogger(__name__)
@@ -22,6 +26,41 @@ def read_input(filename: Path) -> list:
     return puzzle
 
 
+def turn(old_pos: int, dir: str, distance: int, part: int) -> tuple[int, int]:
+    """Turns the dial, for an already parsed instruction
+
+    Does the actual work for calc_pos (part 1) and calc_pos2 (part 2),
+    see there for the explanation.
+
+    :param old_pos: current dial position
+    :type old_pos: int
+    :param dir: direction, R or L
+    :type dir: str
+    :param distance: distance to rotate
+    :type distance: int
+    :param part: Part 1 or 2 from puzzle
+    :type part: int
+    :raises NotImplementedError: when unknown instruction is called
+    :return: new position and amount of clicks
+    :rtype: tuple
+    """
+    if dir == "R":
+        new = old_pos + distance
+        clicks = (old_pos + distance) // 100
+    elif dir == "L":
+        new = old_pos - distance
+        clicks = ((100 - old_pos) % 100 + distance) // 100
+    else:
+        raise NotImplementedError
+
+    new = new % 100
+
+    if part == 1:
+        clicks = 1 if new == 0 else 0
+
+    return new, clicks
+
+
 def calc_pos(old_pos: int, instruction: str) -> tuple[int, int]:
     """Calculate new position of dial and amount of clicks
 
@@ -41,17 +80,7 @@ def calc_pos(old_pos: int, instruction: str) -> tuple[int, int]:
     :rtype: tuple
     """
     dir, distance = instruction[0], int(instruction[1:])
-    if dir == "R":
-        new = old_pos + distance
-    elif dir == "L":
-        new = old_pos - distance
-    else:
-        raise NotImplementedError
-
-    new = new % 100
-    clicks = 0
-    if new == 0:
-        clicks = 1
+    new, clicks = turn(old_pos, dir, distance, 1)
 
     logger.debug(f"I'm at {old_pos}, rotating {instruction} ({dir}, {distance}) to {new}")
 
@@ -81,16 +110,7 @@ def calc_pos2(old_pos: int, instruction: str) -> tuple[int, int]:
     :rtype: tuple
     """
     dir, distance = instruction[0], int(instruction[1:])
-    if dir == "R":
-        new = old_pos + distance
-        clicks = (old_pos + distance) // 100
-    elif dir == "L":
-        new = old_pos - distance
-        clicks = ((100 - old_pos) % 100 + distance) // 100
-    else:
-        raise NotImplementedError
-
-    new = new % 100
+    new, clicks = turn(old_pos, dir, distance, 2)
 
     logger.debug(f"I'm at {old_pos}, rotating {instruction} ({dir}, {distance}) to {new}, clicked {clicks} times")
 
@@ -123,6 +143,458 @@ def main(puzzle: list, part: int) -> int:
     return total_clicks
 
 
+def iter_instructions(filename: Path, chunk_size: int = 1 << 16):
+    """Streams instructions from input file, without loading the whole file
+
+    The file is read in chunks of bytes. A chunk usually ends halfway a line,
+    so that part is kept and glued to the next chunk.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param chunk_size: amount of bytes to read at once
+    :type chunk_size: int
+    :yield: direction and distance, like ('R', 17)
+    :rtype: Iterator[tuple[str, int]]
+    """
+    rest = b''
+    with open(filename, "rb") as f:
+        while chunk := f.read(chunk_size):
+            lines = (rest + chunk).split(b'\n')
+
+            # Last line might be incomplete, keep it for the next chunk
+            rest = lines.pop()
+
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield chr(line[0]), int(line[1:])
+
+    rest = rest.strip()
+    if rest:
+        yield chr(rest[0]), int(rest[1:])
+
+
+def main_stream(filename: Path, part: int, chunk_size: int = 1 << 16) -> int:
+    """Same as main, but streams the instructions from file,
+    so only the dial state is kept in memory.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param part: Part 1 or 2 from puzzle
+    :type part: int
+    :param chunk_size: amount of bytes to read at once
+    :type chunk_size: int
+    :return: amount of clicks
+    :rtype: int
+    """
+    pos = 50
+    total_clicks = 0
+
+    for dir, distance in iter_instructions(filename, chunk_size):
+        pos, clicks = turn(pos, dir, distance, part)
+        total_clicks += clicks
+
+    logger.info(f'Finished at: {pos}, with {total_clicks=}')
+
+    return total_clicks
+
+
+def parse_distances(data: bytes) -> np.ndarray:
+    """Parses a complete instruction log into signed distances, in one go
+
+    Instead of slicing and int()-parsing every line, the raw bytes are handled
+    as a NumPy array. The line ends give the start of each instruction, and then
+    the distances are built up place by place (ones, tens, ...) for all lines at once.
+    R is a positive distance, L a negative one. Empty lines are skipped.
+
+    :param data: raw instruction log, like b"L68\\nR48\\n"
+    :type data: bytes
+    :raises NotImplementedError: when unknown instruction is called
+    :raises ValueError: when an instruction has no (valid) distance
+    :return: signed distances
+    :rtype: np.ndarray
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+
+    # Make sure the last line is terminated as well
+    if len(raw) > 0 and raw[-1] != ord('\n'):
+        raw = np.append(raw, np.uint8(ord('\n')))
+
+    ends = np.flatnonzero(raw == ord('\n'))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    np.add(ends[:-1], 1, out=starts[1:])
+
+    # Ignore a \r and other trailing whitespace before the line end (like int() and strip() do),
+    # and skip empty lines
+    while True:
+        last = raw[ends - 1]
+        trailing = (ends > starts) & ((last == ord('\r')) | (last == ord(' ')) | (last == ord('\t')))
+        if not trailing.any():
+            break
+        ends = ends - trailing
+    lengths = ends - starts - 1
+    empty = lengths < 0
+    if empty.any():
+        starts, ends, lengths = starts[~empty], ends[~empty], lengths[~empty]
+
+    # Direction is the first character of each line
+    directions = raw[starts]
+    is_right = directions == ord('R')
+    if not np.all(is_right | (directions == ord('L'))):
+        raise NotImplementedError
+
+    # Distance digits are between the direction and the line end
+    if np.any(lengths == 0):
+        raise ValueError('Instruction without distance')
+
+    # Handle the digits by place (ones, tens, ...) counting back from the line ends, so the
+    # loop only runs for the longest distance. Digits stay uint8, and int32 is enough for
+    # distances up to 9 digits: smaller arrays, less work per place.
+    longest = int(lengths.max(initial=0))
+    shortest = int(lengths.min(initial=0))
+    dtype = np.int32 if longest <= 9 else np.int64
+    distances = np.zeros(len(starts), dtype=dtype)
+
+    positions = ends - 1
+    for place in range(longest):
+        digits = raw[positions]
+        digits -= ord('0')
+        if place >= shortest:
+            # Lines which are too short don't have this place, whatever is there counts as 0
+            digits *= lengths > place
+        # Anything below '0' wraps around (uint8), so it's above 9 as well
+        if np.any(digits > 9):
+            raise ValueError('Instruction distance is not a number')
+
+        distances += digits.astype(dtype) * dtype(10 ** place)
+        positions -= 1
+
+    np.negative(distances, out=distances, where=~is_right)
+
+    return distances.astype(np.int64)
+
+
+def read_distances(filename: Path) -> np.ndarray:
+    """Reads from input file straight into signed distances
+
+    :param filename: filename to read
+    :type filename: Path
+    :return: signed distances
+    :rtype: np.ndarray
+    """
+    with open(filename, "rb") as f:
+        return parse_distances(f.read())
+
+
+def main_numpy(distances: np.ndarray, part: int) -> int:
+    """Vectorized version of main, handling all instructions at once
+
+    The dial positions are the running sum of the distances (starting at 50).
+    Modulo 100 gives the position on the dial, so part 1 counts the zeros in there.
+
+    For part 2 the amount of clicks per instruction is the amount of multiples
+    of 100 passed between two consecutive running sums. For a positive rotation
+    this is the difference of the floor division by 100 of the running sums.
+    For negative rotations both sums are shifted by one first: ending on zero
+    counts, starting on zero does not. Same results as calc_pos2.
+
+    :param distances: signed distances, see parse_distances
+    :type distances: np.ndarray
+    :param part: Part 1 or 2 from puzzle
+    :type part: int
+    :return: amount of clicks
+    :rtype: int
+    """
+    positions = np.concatenate(([50], 50 + np.cumsum(distances, dtype=np.int64)))
+
+    if part == 1:
+        total_clicks = int(np.count_nonzero(positions[1:] % 100 == 0))
+    else:
+        passed = positions // 100
+        passed_shifted = (positions - 1) // 100
+        clicks = np.where(
+            distances >= 0,
+            passed[1:] - passed[:-1],
+            passed_shifted[:-1] - passed_shifted[1:])
+        total_clicks = int(clicks.sum())
+
+    pos = int(positions[-1] % 100)
+    logger.info(f'Finished at: {pos}, with {total_clicks=}')
+
+    return total_clicks
+
+
+def identity_table() -> tuple[np.ndarray, np.ndarray]:
+    """Transition table for no instructions at all: every position stays put, without clicks
+
+    :return: exit positions and clicks, for each entry position
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    return np.arange(100, dtype=np.int64), np.zeros(100, dtype=np.int64)
+
+
+def transition_table(distances: np.ndarray, part: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """Summarizes a run of instructions, for all 100 possible entry positions at once
+
+    The exit position is simply the entry position plus the total distance.
+    The clicks depend on the entry position p though. With running sums P of the
+    distances, the dial is at p + P after each instruction, and (like main_numpy)
+    the clicks of an instruction are differences of floor((p + P) / 100).
+    Writing P = 100 * q + r, that floor is q plus 1 when r + p >= 100.
+    So the q parts add up to the same number for every p, and the r parts only
+    need a histogram of residues. Summing that histogram from 100 - p upwards gives
+    the extra clicks for entry position p.
+
+    Part 1 is easier: count the running sums landing on -p (modulo 100).
+
+    :param distances: signed distances, see parse_distances
+    :type distances: np.ndarray
+    :param part: Part 1 or 2 from puzzle
+    :type part: int
+    :return: exit positions and clicks, for each entry position
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    sums = np.concatenate(([0], np.cumsum(distances, dtype=np.int64)))
+    entries = np.arange(100, dtype=np.int64)
+    exits = (entries + sums[-1]) % 100
+
+    if part == 1:
+        landings = np.bincount(sums[1:] % 100, minlength=100)
+        return exits, landings[-entries % 100].astype(np.int64)
+
+    # Right turns count the multiples of 100 in (before, after], left turns
+    # the ones in [after, before), which is the same as (after - 1, before - 1]
+    right = distances >= 0
+    upper = np.where(right, sums[1:], sums[:-1] - 1)
+    lower = np.where(right, sums[:-1], sums[1:] - 1)
+
+    base = int((upper // 100 - lower // 100).sum())
+    residues = (np.bincount(upper % 100, minlength=100)
+                - np.bincount(lower % 100, minlength=100))
+
+    # Extra clicks for entry p: residues from 100 - p up to 99
+    from_top = np.concatenate((np.cumsum(residues[::-1])[::-1], [0]))
+    clicks = base + from_top[100 - entries]
+
+    return exits, clicks.astype(np.int64)
+
+
+def compose(first: tuple[np.ndarray, np.ndarray],
+            second: tuple[np.ndarray, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Combines two transition tables: first run the instructions of first, then of second
+
+    :param first: transition table of the earlier instructions
+    :type first: tuple[np.ndarray, np.ndarray]
+    :param second: transition table of the later instructions
+    :type second: tuple[np.ndarray, np.ndarray]
+    :return: transition table of both
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    first_exits, first_clicks = first
+    second_exits, second_clicks = second
+    return second_exits[first_exits], first_clicks + second_clicks[first_exits]
+
+
+def split_file(filename: Path, shards: int) -> list[tuple[int, int]]:
+    """Splits a file into byte ranges of about the same size, at line boundaries
+
+    :param filename: filename to split
+    :type filename: Path
+    :param shards: amount of ranges
+    :type shards: int
+    :return: list of (start, end) byte offsets
+    :rtype: list[tuple[int, int]]
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+
+    with open(filename, "rb") as f:
+        for i in range(1, shards):
+            # Move the boundary to just after the next line end
+            f.seek(max(size * i // shards, boundaries[-1]))
+            f.readline()
+            boundaries.append(f.tell())
+
+    boundaries.append(size)
+
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def shard_table(args: tuple[Path, int, int, int]) -> tuple[np.ndarray, np.ndarray]:
+    """Worker for main_multi: reads part of the file and summarizes it
+
+    :param args: filename, start and end offset, puzzle part
+    :type args: tuple[Path, int, int, int]
+    :return: transition table for this part of the file
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    filename, start, end, part = args
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    return transition_table(parse_distances(data), part)
+
+
+def main_multi(filename: Path, part: int, processes: int | None = None, shards: int | None = None) -> int:
+    """Same as main, but the file is split up and handled by multiple processes
+
+    Each process summarizes its part of the file in a transition table.
+    Because combining tables is associative, the tables are combined in order
+    afterwards, and the answer is looked up for starting position 50.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param part: Part 1 or 2 from puzzle
+    :type part: int
+    :param processes: amount of processes, defaults to cpu count
+    :type processes: int | None
+    :param shards: amount of file parts, defaults to 4 per process
+    :type shards: int | None
+    :return: amount of clicks
+    :rtype: int
+    """
+    processes = processes or os.cpu_count()
+    shards = shards or 4 * processes
+
+    args_list = [(filename, start, end, part) for start, end in split_file(filename, shards)]
+
+    with multiprocessing.Pool(processes=processes) as pool:
+        tables = pool.map(shard_table, args_list)
+
+    exits, clicks = reduce(compose, tables, identity_table())
+    pos = int(exits[50])
+    total_clicks = int(clicks[50])
+
+    logger.info(f'Finished at: {pos}, with {total_clicks=}')
+
+    return total_clicks
+
+
+class DialIndex():
+    """Segment tree over the instructions, for questions about a part of the instructions.
+
+    Each node holds the transition table (exit position and clicks for all 100 entry positions)
+    of its segment of instructions. The leaves are single instructions, with the same
+    outcome as calc_pos2 (or calc_pos for part 1). Parent nodes combine their children with compose.
+    Uses the bottom-up layout: node i has children 2i and 2i + 1, the leaves start at n.
+
+    This way a range of instructions can be answered by walking O(log n) nodes,
+    and changing an instruction only needs to recalculate O(log n) tables.
+    """
+
+    def __init__(self, puzzle: list, part: int = 2):
+        self.part = part
+        self.n = len(puzzle)
+
+        # Exit positions fit in a byte, saves some memory as there are 2n tables of 100 entries
+        self.exits = np.zeros((2 * self.n, 100), dtype=np.uint8)
+        self.clicks = np.zeros((2 * self.n, 100), dtype=np.int64)
+
+        # Fill in all leaves at once
+        distances = parse_distances('\n'.join(puzzle).encode())
+        self.exits[self.n:], self.clicks[self.n:] = self.leaf(distances)
+
+        # Fill in the parents, one "layer" of node numbers at a time. The children
+        # of a node have higher numbers, so they are always done before their parent
+        stop = self.n
+        while stop > 1:
+            start = max(stop // 2, 1)
+            nodes = np.arange(start, stop)
+            self.exits[nodes], self.clicks[nodes] = self.combine(nodes)
+            stop = start
+
+    def leaf(self, distances: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Transition tables for single instructions, the calc_pos2 formulas for all entry positions
+        entries = np.arange(100, dtype=np.int64)
+        distances = np.asarray(distances, dtype=np.int64).reshape(-1, 1)
+        exits = (entries + distances) % 100
+
+        if self.part == 1:
+            clicks = (exits == 0).astype(np.int64)
+        else:
+            clicks = np.where(
+                distances >= 0,
+                (entries + distances) // 100,
+                ((100 - entries) % 100 - distances) // 100)
+
+        return exits, clicks
+
+    def combine(self, nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # compose, for a bunch of nodes at once: first the left child, then the right child
+        left_exits = self.exits[2 * nodes].astype(np.int64)
+        exits = np.take_along_axis(self.exits[2 * nodes + 1], left_exits, axis=1)
+        clicks = self.clicks[2 * nodes] + np.take_along_axis(self.clicks[2 * nodes + 1], left_exits, axis=1)
+        return exits, clicks
+
+    def query(self, start: int, stop: int, pos: int | None = None) -> tuple[int, int]:
+        """Runs instructions start up to (not including) stop
+
+        :param start: first instruction
+        :type start: int
+        :param stop: instruction to stop at
+        :type stop: int
+        :param pos: dial position at the start, defaults to where the dial is
+            after running the earlier instructions from position 50
+        :type pos: int | None
+        :return: dial position and amount of clicks
+        :rtype: tuple[int, int]
+        """
+        if not 0 <= start <= stop <= self.n:
+            raise IndexError(f'Range {start}-{stop} outside of {self.n} instructions')
+
+        if pos is None:
+            pos, _ = self.query(0, start, 50)
+
+        # Collect the nodes covering the range, in order. Nodes from
+        # the left side come in order, the right side in reverse order.
+        left_nodes, right_nodes = [], []
+        lo, hi = start + self.n, stop + self.n
+        while lo < hi:
+            if lo & 1:
+                left_nodes.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_nodes.append(hi)
+            lo //= 2
+            hi //= 2
+
+        # Only need to follow a single entry position through the tables
+        total_clicks = 0
+        for node in left_nodes + right_nodes[::-1]:
+            total_clicks += int(self.clicks[node, pos])
+            pos = int(self.exits[node, pos])
+
+        return pos, total_clicks
+
+    def update(self, k: int, instruction: str) -> None:
+        """Replaces instruction k, like R17
+
+        :param k: instruction number
+        :type k: int
+        :param instruction: new instruction
+        :type instruction: str
+        :raises NotImplementedError: when unknown instruction is called
+        """
+        if not 0 <= k < self.n:
+            raise IndexError(f'Instruction {k} outside of {self.n} instructions')
+
+        dir, distance = instruction[0], int(instruction[1:])
+        if dir not in "RL":
+            raise NotImplementedError
+
+        node = k + self.n
+        self.exits[node], self.clicks[node] = self.leaf([distance if dir == "R" else -distance])
+
+        # Walk up, recalculating the parents
+        node //= 2
+        while node >= 1:
+            self.exits[node], self.clicks[node] = self.combine(np.array([node]))
+            node //= 2
+
+
 if __name__ == "__main__":  # pragma: no cover
     puzzle = read_input(Path("01/input.txt"))
     main(puzzle, 1)
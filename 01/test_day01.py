@@ -0,0 +1,176 @@
+from day01 import (
+    DialIndex, calc_pos2, compose, identity_table, iter_instructions, main, main_multi, main_numpy, main_stream,
+    parse_distances, read_distances, read_input, split_file, transition_table, turn)
+from pathlib import Path
+import random
+import numpy as np
+import pytest
+
+
+def test_parse_distances():
+    assert parse_distances(b"L68\nR48\n\nR1000").tolist() == [-68, 48, 1000]
+
+
+def test_parse_distances_crlf():
+    assert parse_distances(b"L5\r\nR60\r\n").tolist() == [-5, 60]
+    # Trailing spaces and tabs, like int() accepts them
+    assert parse_distances(b"L5 \r\nR60\t\n  \nR7 ").tolist() == [-5, 60, 7]
+
+
+def test_parse_distances_long():
+    # More than 9 digits doesn't fit in an int32
+    assert parse_distances(b"R1234567890123\nL7\nL50000000000").tolist() == [1234567890123, -7, -50000000000]
+
+
+@pytest.mark.parametrize("data", [b"R5\nL1x0\n", b"R5\nL 10\n", b"R12\nL/\n"])
+def test_parse_distance_not_a_number(data):
+    with pytest.raises(ValueError):
+        parse_distances(data)
+
+
+def test_parse_instruction_not_defined():
+    with pytest.raises(NotImplementedError):
+        parse_distances(b"R5\nX10\n")
+
+
+def test_parse_no_distance():
+    with pytest.raises(ValueError):
+        parse_distances(b"R5\nL\n")
+
+
+def test_sample1_numpy():
+    distances = read_distances(Path('01/sample01.txt'))
+    assert main_numpy(distances, 1) == 3
+    assert main_numpy(distances, 2) == 6
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_numpy_matches_main(part):
+    random.seed(part)
+    puzzle = [random.choice("LR") + str(random.randint(0, 1000)) for _ in range(1000)]
+    distances = parse_distances('\n'.join(puzzle).encode())
+    assert main_numpy(distances, part) == main(puzzle, part)
+
+
+def test_numpy_matches_main_sample():
+    puzzle = read_input(Path('01/sample01.txt'))
+    assert main_numpy(parse_distances('\n'.join(puzzle).encode()), 2) == main(puzzle, 2)
+
+
+def test_iter_instructions_small_chunks():
+    # Chunks of 2 bytes, so every instruction is split over multiple chunks
+    instructions = list(iter_instructions(Path('01/sample01.txt'), chunk_size=2))
+    assert instructions[:3] == [('L', 68), ('L', 30), ('R', 48)]
+    assert len(instructions) == 10
+
+
+@pytest.mark.parametrize("part, expected", [(1, 3), (2, 6)])
+def test_sample1_stream(part, expected):
+    assert main_stream(Path('01/sample01.txt'), part, chunk_size=7) == expected
+
+
+def test_stream_instruction_not_defined(tmp_path):
+    filename = tmp_path / 'instructions.txt'
+    filename.write_text("R5\nX10\n")
+    with pytest.raises(NotImplementedError):
+        main_stream(filename, 2)
+
+
+@pytest.fixture
+def random_log(tmp_path):
+    random.seed(2025)
+    puzzle = [random.choice("LR") + str(random.randint(0, 1000)) for _ in range(2000)]
+    filename = tmp_path / 'instructions.txt'
+    filename.write_text('\n'.join(puzzle) + '\n')
+    return filename, puzzle
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_transition_table(part):
+    distances = np.array([-68, -30, 48, -5, 60, -55, -1, -99, 14, -82, 100, -100, 0])
+    exits, clicks = transition_table(distances, part)
+
+    for entry in range(100):
+        pos, total_clicks = entry, 0
+        for distance in distances:
+            pos, c = turn(pos, "R" if distance >= 0 else "L", abs(int(distance)), part)
+            total_clicks += c
+        assert (exits[entry], clicks[entry]) == (pos, total_clicks)
+
+
+def test_compose():
+    distances = np.array([250, -17, -300, 42, 58, -1])
+    combined = compose(transition_table(distances[:2]), transition_table(distances[2:]))
+    expected = transition_table(distances)
+    assert np.array_equal(combined[0], expected[0])
+    assert np.array_equal(combined[1], expected[1])
+
+    combined = compose(identity_table(), expected)
+    assert np.array_equal(combined[1], expected[1])
+
+
+def test_split_file(random_log):
+    filename, puzzle = random_log
+    ranges = split_file(filename, 7)
+    data = filename.read_bytes()
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(data[end - 1:end] == b'\n' for _, end in ranges)
+    assert sum(len(data[start:end].splitlines()) for start, end in ranges) == len(puzzle)
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_multi_matches_main(random_log, part):
+    filename, puzzle = random_log
+    assert main_multi(filename, part, processes=2, shards=5) == main(puzzle, part)
+
+
+def test_sample1_multi():
+    assert main_multi(Path('01/sample01.txt'), 2, processes=2) == 6
+
+
+@pytest.fixture
+def sample_index():
+    return DialIndex(read_input(Path('01/sample01.txt')))
+
+
+def test_index_sample1(sample_index):
+    assert sample_index.query(0, 10) == (32, 6)
+    assert DialIndex(read_input(Path('01/sample01.txt')), part=1).query(0, 10)[1] == 3
+
+
+def test_index_subrange(sample_index):
+    # Dial is at 82 after L68, L30 brings it to 52 and R48 to 0
+    assert sample_index.query(1, 3) == (0, 1)
+    assert sample_index.query(1, 3, pos=50) == (68, 0)
+    assert sample_index.query(4, 4) == (sample_index.query(0, 4)[0], 0)
+
+
+def test_index_update(sample_index):
+    puzzle = read_input(Path('01/sample01.txt'))
+    puzzle[2] = "R1048"
+    sample_index.update(2, "R1048")
+    assert sample_index.query(0, 10)[1] == main(puzzle, 2)
+
+
+def test_index_random_ranges():
+    random.seed(4)
+    puzzle = [random.choice("LR") + str(random.randint(0, 300)) for _ in range(37)]
+    index = DialIndex(puzzle)
+
+    for _ in range(50):
+        start = random.randint(0, len(puzzle))
+        stop = random.randint(start, len(puzzle))
+        pos, total_clicks = random.randrange(100), 0
+        answer = index.query(start, stop, pos)
+        for instr in puzzle[start:stop]:
+            pos, clicks = calc_pos2(pos, instr)
+            total_clicks += clicks
+        assert answer == (pos, total_clicks)
+
+
+def test_index_errors(sample_index):
+    with pytest.raises(IndexError):
+        sample_index.query(3, 11)
+    with pytest.raises(NotImplementedError):
+        sample_index.update(0, "X10")
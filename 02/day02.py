@@ -1,5 +1,14 @@
 from pathlib import Path
 from collections import Counter
+from itertools import accumulate, combinations
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+import heapq
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
 
 import logging
 import coloredlogs
@@ -101,8 +110,10 @@ def main(puzzle: list, part: int) -> int:
     :rtype: int
     """
     total = 0
+    checked = 0
+    start_time = time.perf_counter()
     for item in puzzle:
-        logger.info(f'Processing {item=}')
+        logger.debug(f'Processing {item=}')
         low, high = item.split('-')
 
         for i in range(int(low), int(high) + 1):
@@ -111,9 +122,504 @@ def main(puzzle: list, part: int) -> int:
             else:
                 total += valid_id2(str(i))
 
+        checked += int(high) - int(low) + 1
+
+    log_throughput(checked, time.perf_counter() - start_time)
+
+    return total
+
+
+def log_throughput(checked: int, duration: float) -> None:
+    """Logs the amount of IDs checked, and how fast
+
+    :param checked: amount of IDs checked
+    :type checked: int
+    :param duration: time it took, in seconds
+    :type duration: float
+    """
+    rate = checked / duration if duration > 0 else float('inf')
+    logger.info(f'Checked {checked} IDs in {duration:.2f} s ({rate / 1e6:.2f} M IDs/s)')
+
+
+def repunit(length: int, block: int) -> int:
+    """Multiplier that repeats a block of digits to the full length, like 1001001 for
+    a block of 3 digits repeated to 9 digits. So 123 * 1001001 = 123123123.
+
+    :param length: total amount of digits
+    :type length: int
+    :param block: amount of digits in the block, should divide length
+    :type block: int
+    :return: multiplier
+    :rtype: int
+    """
+    return (10 ** length - 1) // (10 ** block - 1)
+
+
+def prime_factors(n: int) -> list:
+    """Distinct prime factors of n (small numbers only, these are digit counts)
+
+    :param n: number to factorize
+    :type n: int
+    :return: prime factors
+    :rtype: list
+    """
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def block_range(low: int, high: int, length: int, block: int) -> tuple[int, int, int]:
+    """Finds which blocks give an ID of _length_ digits within low-high, when repeated
+
+    :param low: start of range
+    :type low: int
+    :param high: end of range (inclusive)
+    :type high: int
+    :param length: amount of digits of the ID
+    :type length: int
+    :param block: amount of digits of the repeated block
+    :type block: int
+    :return: first and last block (first > last when there are none) and the multiplier
+    :rtype: tuple[int, int, int]
+    """
+    multiplier = repunit(length, block)
+
+    # Blocks can't start with 0, and need to end up in low-high
+    first = max(10 ** (block - 1), -(-low // multiplier))
+    last = min(10 ** block - 1, high // multiplier)
+
+    return first, last, multiplier
+
+
+def block_sum(low: int, high: int, length: int, block: int) -> int:
+    """Sums all IDs in low-high of _length_ digits, made of a _block_-digit block repeated.
+
+    These IDs are block * repunit, so instead of looping over the range only the
+    range of blocks is needed: an arithmetic series.
+
+    :param low: start of range
+    :type low: int
+    :param high: end of range (inclusive)
+    :type high: int
+    :param length: amount of digits of the ID
+    :type length: int
+    :param block: amount of digits of the repeated block
+    :type block: int
+    :return: sum of IDs
+    :rtype: int
+    """
+    first, last, multiplier = block_range(low, high, length, block)
+    if first > last:
+        return 0
+
+    return multiplier * (first + last) * (last - first + 1) // 2
+
+
+def invalid_sum(low: int, high: int, part: int) -> int:
+    """Sums the invalid IDs in low-high, without looking at each ID. Same answer as
+    looping over valid_id (part 1) or valid_id2 (part 2).
+
+    Part 1 is easy: only IDs with an even amount of digits, made of a block repeated twice.
+
+    Part 2 allows any repetition, but then 111111 would be counted for blocks of 1, 2 and 3 digits.
+    Every repetition is also a repetition of a "maximal" block: the length divided by a prime,
+    so only those need to be added. Then inclusion-exclusion fixes the IDs counted multiple times:
+    an ID repeating blocks of length/p and length/q also repeats blocks of length/(p*q).
+
+    :param low: start of range
+    :type low: int
+    :param high: end of range (inclusive)
+    :type high: int
+    :param part: which part of the puzzle
+    :type part: int
+    :return: sum of invalid IDs
+    :rtype: int
+    """
+    total = 0
+    for length in range(len(str(low)), len(str(high)) + 1):
+        if part == 1:
+            if length % 2 == 0:
+                total += block_sum(low, high, length, length // 2)
+            continue
+
+        primes = prime_factors(length)
+        for n in range(1, len(primes) + 1):
+            sign = 1 if n % 2 == 1 else -1
+            for chosen in combinations(primes, n):
+                total += sign * block_sum(low, high, length, length // math.prod(chosen))
+
+    return total
+
+
+def main_fast(puzzle: list, part: int) -> int:
+    """Same as main, but calculates the invalid IDs per range instead of checking all of them
+
+    :param puzzle: ID ranges
+    :type puzzle: list
+    :param part: which part of the puzzle
+    :type part: int
+    :return: total score
+    :rtype: int
+    """
+    total = 0
+    for item in puzzle:
+        low, high = item.split('-')
+        total += invalid_sum(int(low), int(high), part)
+
     return total
 
 
+def merge_ranges(puzzle: list) -> list:
+    """Sorts the ID ranges and combines overlapping (or touching) ranges,
+    so every ID is in at most one range.
+
+    :param puzzle: ID ranges, like ['11-22', '15-30']
+    :type puzzle: list
+    :return: merged (low, high) ranges
+    :rtype: list
+    """
+    ranges = sorted(tuple(int(x) for x in item.split('-')) for item in puzzle)
+
+    merged = []
+    for low, high in ranges:
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+
+    return merged
+
+
+def iter_invalid_ids(puzzle: list, part: int):
+    """Yields the invalid IDs in the ranges, in ascending order.
+
+    Like invalid_sum, the IDs are generated from the blocks, so the valid IDs
+    in between are never looked at. The ranges are merged first, so every ID
+    is given only once.
+
+    Within a digit length, part 2 has a sorted stream of IDs per "maximal" block length
+    (see invalid_sum). These are merged, skipping IDs repeating multiple block lengths.
+
+    :param puzzle: ID ranges
+    :type puzzle: list
+    :param part: which part of the puzzle
+    :type part: int
+    :yield: invalid IDs
+    :rtype: Iterator[int]
+    """
+    def repeated(low, high, length, block):
+        first, last, multiplier = block_range(low, high, length, block)
+        for b in range(first, last + 1):
+            yield b * multiplier
+
+    for low, high in merge_ranges(puzzle):
+        for length in range(len(str(low)), len(str(high)) + 1):
+            if part == 1:
+                blocks = [length // 2] if length % 2 == 0 else []
+            else:
+                blocks = [length // p for p in prime_factors(length)]
+
+            previous = None
+            for invalid in heapq.merge(*[repeated(low, high, length, block) for block in blocks]):
+                if invalid != previous:
+                    yield invalid
+                previous = invalid
+
+
+# Powers of ten, to find the amount of digits of an ID with bisect
+POWERS_OF_TEN = [10 ** i for i in range(1, 40)]
+
+
+@lru_cache
+def multipliers(length: int, part: int) -> tuple:
+    """The repunits an invalid ID of _length_ digits is divisible by (one of them),
+    only for the "maximal" block lengths, see invalid_sum.
+
+    :param length: amount of digits of the ID
+    :type length: int
+    :param part: which part of the puzzle
+    :type part: int
+    :return: multipliers
+    :rtype: tuple
+    """
+    if part == 1:
+        return (repunit(length, length // 2),) if length % 2 == 0 else ()
+
+    return tuple(repunit(length, length // p) for p in prime_factors(length))
+
+
+def invalid_id_int(id: int, part: int) -> int:
+    """Integer version of valid_id (part 1) and valid_id2 (part 2), without strings or lists.
+
+    An ID repeating a block is the block times a repunit (like 123123123 = 123 * 1001001),
+    so it's enough to check whether the ID is divisible by one of the multipliers for its length.
+    The quotient always is a block with the right amount of digits, as the ID has no leading zeros.
+
+    :param id: Single ID
+    :type id: int
+    :param part: which part of the puzzle
+    :type part: int
+    :return: ID score
+    :rtype: int
+    """
+    length = bisect_right(POWERS_OF_TEN, id) + 1
+    for multiplier in multipliers(length, part):
+        if id % multiplier == 0:
+            return id
+    return 0
+
+
+def classify_block(start: int, stop: int, part: int) -> np.ndarray:
+    """Finds the invalid IDs in start up to (not including) stop, all at once using NumPy.
+
+    Same divisibility check as invalid_id_int, per group of IDs with the same amount of digits.
+    Int64, so IDs should stay below 10^18.
+
+    :param start: first ID
+    :type start: int
+    :param stop: ID to stop at
+    :type stop: int
+    :param part: which part of the puzzle
+    :type part: int
+    :return: mask, True for invalid IDs
+    :rtype: np.ndarray
+    """
+    ids = np.arange(start, stop, dtype=np.int64)
+    invalid = np.zeros(len(ids), dtype=bool)
+
+    # Split the block where the amount of digits changes
+    lengths = range(bisect_right(POWERS_OF_TEN, start) + 1, bisect_right(POWERS_OF_TEN, max(start, stop - 1)) + 2)
+    for length in lengths:
+        lo = max(start, 10 ** (length - 1)) - start
+        hi = min(stop, 10 ** length) - start
+        for multiplier in multipliers(length, part):
+            invalid[lo:hi] |= ids[lo:hi] % multiplier == 0
+
+    return invalid
+
+
+def brute_sum(low: int, high: int, part: int, block_size: int = 1 << 20) -> int:
+    """Sums the invalid IDs in low-high by checking every single one, a block at a time
+
+    :param low: start of range
+    :type low: int
+    :param high: end of range (inclusive)
+    :type high: int
+    :param part: which part of the puzzle
+    :type part: int
+    :param block_size: amount of IDs to check at once
+    :type block_size: int
+    :return: sum of invalid IDs
+    :rtype: int
+    """
+    total = 0
+    for start in range(low, high + 1, block_size):
+        stop = min(start + block_size, high + 1)
+        invalid = classify_block(start, stop, part)
+        total += sum((np.flatnonzero(invalid) + start).tolist())
+
+    return total
+
+
+def main_numpy(puzzle: list, part: int) -> int:
+    """Same as main, but uses the NumPy brute force check
+
+    :param puzzle: ID ranges
+    :type puzzle: list
+    :param part: which part of the puzzle
+    :type part: int
+    :return: total score
+    :rtype: int
+    """
+    total = 0
+    for item in puzzle:
+        low, high = item.split('-')
+        total += brute_sum(int(low), int(high), part)
+
+    return total
+
+
+def split_chunks(ranges: list, processes: int, min_chunk: int = 1 << 16):
+    """Cuts the ranges into chunks for the process pool, big ones first, getting smaller.
+
+    Each chunk is a part of what's left to do, divided over the processes. So the
+    start has large chunks (little overhead), and at the end small chunks keep all
+    processes busy until everything is done. Chunks never cross ranges.
+
+    :param ranges: (low, high) ranges, inclusive
+    :type ranges: list
+    :param processes: amount of processes
+    :type processes: int
+    :param min_chunk: smallest chunk size
+    :type min_chunk: int
+    :yield: (start, stop) chunks, not including stop
+    :rtype: Iterator[tuple[int, int]]
+    """
+    remaining = sum(high - low + 1 for low, high in ranges)
+
+    for low, high in ranges:
+        start = low
+        while start <= high:
+            size = max(min_chunk, remaining // (2 * processes))
+            stop = min(start + size, high + 1)
+            yield start, stop
+
+            remaining -= stop - start
+            start = stop
+
+
+def chunk_sum(args: tuple[int, int, int]) -> tuple[int, int]:
+    """Worker for main_parallel: brute force check of a chunk
+
+    :param args: start, stop (not included) and puzzle part
+    :type args: tuple[int, int, int]
+    :return: sum of invalid IDs and amount of IDs checked
+    :rtype: tuple[int, int]
+    """
+    start, stop, part = args
+    return brute_sum(start, stop - 1, part), stop - start
+
+
+def main_parallel(puzzle: list, part: int, processes: int | None = None,
+                  min_chunk: int = 1 << 16, report_every: float = 5.0) -> int:
+    """Same as main, brute forcing all IDs, but spread over multiple processes.
+
+    The ranges are cut into chunks (see split_chunks), which are handed out one at a time:
+    a process that's done just picks up the next one, so one huge range is shared by all.
+    Progress is reported for everything together, every _report_every_ seconds.
+
+    :param puzzle: ID ranges
+    :type puzzle: list
+    :param part: which part of the puzzle
+    :type part: int
+    :param processes: amount of processes, defaults to cpu count
+    :type processes: int | None
+    :param min_chunk: smallest chunk size
+    :type min_chunk: int
+    :param report_every: seconds between progress reports
+    :type report_every: float
+    :return: total score
+    :rtype: int
+    """
+    processes = processes or os.cpu_count()
+    ranges = [tuple(int(x) for x in item.split('-')) for item in puzzle]
+    to_check = sum(high - low + 1 for low, high in ranges)
+
+    total = 0
+    checked = 0
+    start_time = last_report = time.perf_counter()
+
+    args_list = ((start, stop, part) for start, stop in split_chunks(ranges, processes, min_chunk))
+    with multiprocessing.Pool(processes=processes) as pool:
+        for chunk_total, chunk_checked in pool.imap_unordered(chunk_sum, args_list):
+            total += chunk_total
+            checked += chunk_checked
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                logger.info(f'{checked / to_check:.1%} done, {checked / (now - start_time) / 1e6:.2f} M IDs/s')
+                last_report = now
+
+    log_throughput(checked, time.perf_counter() - start_time)
+
+    return total
+
+
+class InvalidIDIndex():
+    """All invalid IDs up to a number of digits, sorted, with running sums.
+    The sum of the invalid IDs in a range is then just two bisect lookups.
+
+    Building takes a while (and memory!), so the IDs are cached on disk
+    as a NumPy file. Int64 limits this to 18 digits.
+    """
+
+    def __init__(self, part: int, digits: int = 12, cache_dir: Path = Path('02/cache')):
+        if not 1 <= digits <= 18:
+            raise ValueError(f'Cannot index {digits} digits, 1 up to 18 is supported')
+
+        self.part = part
+        self.digits = digits
+        self.limit = 10 ** digits
+
+        cache_file = cache_dir / f'invalid_ids_part{part}_{digits}.npy'
+        if cache_file.exists():
+            logger.info(f'Loading invalid IDs from {cache_file}')
+            ids = np.load(cache_file)
+        else:
+            logger.info(f'Building invalid IDs index up to {digits} digits')
+            ids = self.build()
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            np.save(cache_file, ids)
+
+        # Python ints from here, the sums don't fit in an int64
+        self.ids = ids.tolist()
+        self.sums = list(accumulate(self.ids, initial=0))
+
+    def build(self) -> np.ndarray:
+        # Every invalid ID is a block times a repunit
+        parts = []
+        for length in range(2, self.digits + 1):
+            if self.part == 1:
+                blocks = [length // 2] if length % 2 == 0 else []
+            else:
+                blocks = [block for block in range(1, length) if length % block == 0]
+
+            for block in blocks:
+                parts.append(np.arange(10 ** (block - 1), 10 ** block, dtype=np.int64) * repunit(length, block))
+
+        # IDs can repeat blocks of multiple lengths, only keep them once
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def range_sum(self, low: int, high: int) -> int:
+        """Sums the invalid IDs in low-high. The part above the index is calculated with invalid_sum.
+
+        :param low: start of range
+        :type low: int
+        :param high: end of range (inclusive)
+        :type high: int
+        :return: sum of invalid IDs
+        :rtype: int
+        """
+        total = 0
+        if high >= self.limit:
+            total += invalid_sum(max(low, self.limit), high, self.part)
+            high = self.limit - 1
+
+        if low <= high:
+            total += self.sums[bisect_right(self.ids, high)] - self.sums[bisect_left(self.ids, low)]
+
+        return total
+
+
+def main_batch(puzzle: list, part: int, index: InvalidIDIndex | None = None) -> int:
+    """Sums the invalid IDs of a lot of (overlapping) ranges, using an index.
+
+    The ranges are merged first, so IDs in multiple ranges are only counted once.
+
+    :param puzzle: ID ranges
+    :type puzzle: list
+    :param part: which part of the puzzle
+    :type part: int
+    :param index: index to use, defaults to building/loading one with default settings
+    :type index: InvalidIDIndex | None
+    :return: total score
+    :rtype: int
+    """
+    index = index or InvalidIDIndex(part)
+    if index.part != part:
+        raise ValueError(f'Index is for part {index.part}, not part {part}')
+
+    return sum(index.range_sum(low, high) for low, high in merge_ranges(puzzle))
+
+
 if __name__ == "__main__":  # pragma: no cover
     puzzle = read_input(Path("02/input.txt"))
     logger.info(f'Total score part 1: {main(puzzle, 1)}')
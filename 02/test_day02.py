@@ -0,0 +1,145 @@
+from day02 import (
+    InvalidIDIndex, brute_sum, classify_block, invalid_id_int, invalid_sum, iter_invalid_ids, main, main_batch,
+    main_fast, main_numpy, main_parallel, merge_ranges, read_input, repunit, split_chunks, valid_id, valid_id2)
+from pathlib import Path
+import random
+import pytest
+
+
+def test_repunit():
+    assert repunit(9, 3) == 1001001
+    assert repunit(6, 1) == 111111
+
+
+@pytest.mark.parametrize("part, expected", [(1, 1227775554), (2, 4174379265)])
+def test_sample1_fast(part, expected):
+    assert main_fast(read_input(Path('02/sample01.txt')), part) == expected
+
+
+def test_no_double_counting():
+    # 111111 repeats blocks of 1, 2 and 3 digits
+    assert invalid_sum(111110, 111112, 2) == 111111
+    assert invalid_sum(111110, 111112, 1) == 111111
+    assert invalid_sum(11111, 11111, 1) == 0
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_fast_matches_brute_force(part):
+    random.seed(part)
+    check = valid_id if part == 1 else valid_id2
+    for _ in range(100):
+        low = random.randint(1, 2_000_000)
+        high = low + random.randint(0, 2000)
+        assert invalid_sum(low, high, part) == sum(check(str(i)) for i in range(low, high + 1))
+
+
+def test_huge_range():
+    # All 2h digit numbers made of a block repeated twice, up to 10^12
+    expected = sum(
+        (10 ** h + 1) * sum(range(10 ** (h - 1), 10 ** h))
+        for h in range(1, 7))
+    assert invalid_sum(1, 10 ** 12 - 1, 1) == expected
+    assert main_fast(['1-999999999999'], 1) == expected
+
+
+@pytest.fixture(params=[1, 2])
+def index(request, tmp_path):
+    return InvalidIDIndex(request.param, digits=6, cache_dir=tmp_path)
+
+
+def test_merge_ranges():
+    assert merge_ranges(['15-30', '11-22', '31-40', '50-60']) == [(11, 40), (50, 60)]
+
+
+def test_index_matches_invalid_sum(index):
+    random.seed(6)
+    for _ in range(200):
+        low = random.randint(1, 2_000_000)
+        high = low + random.randint(0, 200_000)
+        assert index.range_sum(low, high) == invalid_sum(low, high, index.part)
+
+
+def test_index_cache(index, tmp_path):
+    assert (tmp_path / f'invalid_ids_part{index.part}_6.npy').exists()
+    assert InvalidIDIndex(index.part, digits=6, cache_dir=tmp_path).ids == index.ids
+
+
+def test_index_limits(tmp_path):
+    with pytest.raises(ValueError):
+        InvalidIDIndex(1, digits=19, cache_dir=tmp_path)
+
+
+def test_batch(index):
+    puzzle = read_input(Path('02/sample01.txt'))
+    assert main_batch(puzzle, index.part, index) == main_fast(puzzle, index.part)
+
+    # Overlapping ranges: 22 is only counted once
+    assert main_batch(['11-22', '15-30'], index.part, index) == 11 + 22
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_iter_invalid_ids(part):
+    check = valid_id if part == 1 else valid_id2
+    puzzle = ['95-115', '998-1012', '100-200000', '150000-250000']
+    expected = [i for i in range(95, 250001) if check(str(i))]
+    assert list(iter_invalid_ids(puzzle, part)) == expected
+
+
+def test_iter_invalid_ids_sample():
+    puzzle = read_input(Path('02/sample01.txt'))
+    assert sum(iter_invalid_ids(puzzle, 2)) == 4174379265
+    assert list(iter_invalid_ids(['111110-111112'], 2)) == [111111]
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_invalid_id_int(part):
+    check = valid_id if part == 1 else valid_id2
+    for i in range(1, 20000):
+        assert invalid_id_int(i, part) == check(str(i))
+
+
+def test_invalid_id_int_examples():
+    assert invalid_id_int(123123123, 2) == 123123123
+    assert invalid_id_int(123123123, 1) == 0
+    assert invalid_id_int(1111111, 2) == 1111111
+    assert invalid_id_int(1698522, 2) == 0
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_classify_block(part):
+    check = valid_id if part == 1 else valid_id2
+    invalid = classify_block(5, 20000, part)
+    assert invalid.tolist() == [check(str(i)) > 0 for i in range(5, 20000)]
+
+
+@pytest.mark.parametrize("part, expected", [(1, 1227775554), (2, 4174379265)])
+def test_sample1_numpy(part, expected):
+    assert main_numpy(read_input(Path('02/sample01.txt')), part) == expected
+
+
+def test_brute_sum_matches_invalid_sum():
+    random.seed(8)
+    for _ in range(20):
+        low = random.randint(1, 10 ** 15)
+        high = low + random.randint(0, 50_000)
+        assert brute_sum(low, high, 2, block_size=4096) == invalid_sum(low, high, 2)
+
+
+def test_split_chunks():
+    ranges = [(1, 1000), (5000, 5009)]
+    chunks = list(split_chunks(ranges, processes=2, min_chunk=10))
+
+    # Chunks cover the ranges exactly, and get smaller
+    assert sum(stop - start for start, stop in chunks) == 1010
+    assert chunks[0] == (1, 253)
+    assert chunks[-1] == (5000, 5010)
+    assert chunks[1][1] - chunks[1][0] <= chunks[0][1] - chunks[0][0]
+
+
+@pytest.mark.parametrize("part, expected", [(1, 1227775554), (2, 4174379265)])
+def test_sample1_parallel(part, expected):
+    assert main_parallel(read_input(Path('02/sample01.txt')), part, processes=2, min_chunk=3) == expected
+
+
+def test_parallel_huge_range():
+    assert main_parallel(['1-2000000'], 2, processes=2) == invalid_sum(1, 2000000, 2)
@@ -0,0 +1,73 @@
+from pathlib import Path
+import logging
+import random
+import tempfile
+import time
+import coloredlogs
+import day03
+from day03 import BankIndex, joltage_k, main, main_mmap, main_numpy, read_input
+
+coloredlogs.install(level='INFO')
+logger = logging.getLogger(__name__)
+
+logging.getLogger(day03.__name__).setLevel(logging.WARNING)
+
+
+def generate_banks(amount: int, length: int) -> list:
+    """Random battery banks
+
+    :param amount: amount of banks
+    :type amount: int
+    :param length: amount of batteries per bank
+    :type length: int
+    :return: banks
+    :rtype: list
+    """
+    random.seed(2025)
+    return [''.join(random.choices('123456789', k=length)) for _ in range(amount)]
+
+
+def timed(label: str, digits: int, func, *args):
+    """Runs func and logs the digits per second, returns what func returns"""
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    logger.info(f'{label:<32} {duration:8.3f} s {digits / duration / 1e6:8.2f} M digits/s')
+    return result
+
+
+def bench_joltage_k(length: int = 1_000_000) -> None:
+    bank, = generate_banks(1, length)
+    for k in (2, 12, 1000, length // 2):
+        timed(f'joltage_k k={k}', length, joltage_k, bank, k)
+
+
+def bench_batched(amount: int = 100_000, length: int = 100) -> None:
+    puzzle = generate_banks(amount, length)
+    for part in (1, 2):
+        timed(f'main part {part}', amount * length, main, puzzle, part)
+        timed(f'main_numpy part {part}', amount * length, main_numpy, puzzle, part)
+
+
+def bench_profile(length: int = 1_000_000, ks: tuple = (2, 12, 100, 1000)) -> None:
+    bank, = generate_banks(1, length)
+    index = timed('BankIndex build', length, BankIndex, bank)
+    timed(f'joltage_k for k in {ks}', length * len(ks), lambda: [joltage_k(bank, k) for k in ks])
+    timed(f'BankIndex.profile for k in {ks}', length * len(ks), index.profile, ks)
+
+
+def bench_mmap(amount: int = 1000, length: int = 10_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = Path(tmp) / 'banks.txt'
+        filename.write_text('\n'.join(generate_banks(amount, length)))
+
+        for part in (1, 2):
+            timed(f'read_input + main part {part}', amount * length, lambda: main(read_input(filename), part))
+            timed(f'main_mmap part {part}', amount * length, main_mmap, filename, part)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    bench_joltage_k()
+    bench_batched()
+    bench_profile()
+    bench_mmap()
@@ -1,4 +1,8 @@
 from pathlib import Path
+from collections import defaultdict
+from functools import lru_cache
+import mmap
+import numpy as np
 
 import logging
 import coloredlogs
@@ -29,71 +33,177 @@ def read_input(filename: Path) -> list:
     return puzzle
 
 
-def joltage(bank: str) -> int:
-    """Finds 2-figure joltage, by first looking for the largest digit at bank length - 1.
-    Then finding that position and looking for the second part by looking from the first-found
-    value to the last of the bank.
+@lru_cache
+def power_of_ten(exponent: int) -> int:
+    """10 ** exponent, cached as digits_to_int keeps asking for the same ones
 
-    :param bank: battery bank data
+    :param exponent: exponent
+    :type exponent: int
+    :return: power of ten
+    :rtype: int
+    """
+    return 10 ** exponent
+
+
+def digits_to_int(digits: str) -> int:
+    """Converts a string of digits to an integer, also when it's longer than Python allows
+    for int() (4300 digits). Long strings are split in halves, which are converted
+    separately and combined as high * 10^len(low) + low.
+
+    :param digits: digits
+    :type digits: str
+    :return: number
+    :rtype: int
+    """
+    if len(digits) <= 1000:
+        return int(digits)
+
+    half = len(digits) // 2
+    return digits_to_int(digits[:half]) * power_of_ten(len(digits) - half) + digits_to_int(digits[half:])
+
+
+def joltage_k(bank: str, k: int) -> int:
+    """Determines the largest joltage for a bank, by selecting k batteries (keeping their order).
+
+    Goes over the bank once, keeping a stack of selected digits. When a digit comes along
+    that's larger than the top of the stack, the smaller one on the stack is dropped,
+    as the number gets larger by moving the larger digit to the front. This is only allowed as long
+    as enough digits are left to still fill k places (so at most len(bank) - k drops).
+    Every digit is pushed and dropped at most once, so O(n) for any k.
+
+    Gives the same digits as picking the (leftmost) highest digit in a "moving window", like joltage2 used to.
+
+    :param bank: Battery bank
     :type bank: str
-    :return: joltage
+    :param k: amount of batteries to select
+    :type k: int
+    :raises ValueError: when the bank doesn't have k batteries
+    :return: Joltage
     :rtype: int
     """
-    logger.debug(f'Bank: {bank}')
+    if not 0 < k <= len(bank):
+        raise ValueError(f'Cannot select {k} batteries from a bank of {len(bank)}')
 
-    left = bank[:-1]
-    digits = list(map(int, left))
-    max_tens = max(digits)
-    max_pos = digits.index(max_tens)
+    drops_left = len(bank) - k
+    stack = []
 
-    right = bank[max_pos + 1:]
-    digits = list(map(int, right))
-    max_ones = max(digits)
+    for digit in bank:
+        while drops_left > 0 and stack and stack[-1] < digit:
+            stack.pop()
+            drops_left -= 1
+        stack.append(digit)
 
-    joltage = 10 * max_tens + max_ones
-    logger.debug(f'Found tens: {max_tens} and then {max_ones}, gives {joltage}')
+    # Not all drops might have been used (like a bank of 9's), the extra digits are at the end
+    selected = ''.join(stack[:k])
+    logger.debug(f'Bank: {bank}, {k=}, joltage={selected}')
+
+    return digits_to_int(selected)
 
-    return joltage
+
+def joltage(bank: str) -> int:
+    """Finds 2-figure joltage, the largest number made by 2 batteries of the bank
+
+    :param bank: battery bank data
+    :type bank: str
+    :return: joltage
+    :rtype: int
+    """
+    return joltage_k(bank, 2)
 
 
 def joltage2(bank: str) -> int:
     """Determines joltage for each bank, by selecting 12 batteries.
-    Each battery is selected from the bank by setting up a "moving window", looking for
-    the highest value battery.
 
     :param bank: Battery bank
     :type bank: str
     :return: Joltage
     :rtype: int
     """
+    return joltage_k(bank, 12)
 
-    # Start position
-    i = 0
-    selected_digits = []
-    required_digits = 12
-    bank_length = len(bank)
-
-    logger.debug(f'Bank: {bank}, {bank_length=}')
-
-    # Loop over the bank, each time selecting a subset of the bank.
-    # The end_index is used to keep 'space' to be able to select digits
-    # to keep on filling the required digit length
-    for end_index in range(bank_length - required_digits, bank_length):
-        # Find the maximum digit by looking in the range where we picked the last
-        # digit to the last possible digit (end_index)
-        # With the range function we get the indexes for the bank
-        # and by using the key keyword, we're looking into the actual digit of the bank
-        i = max(range(i, end_index + 1), key=bank.__getitem__)
-
-        # Add the digit to the collection
-        selected_digits.append(bank[i])
-
-        # Increase i by 1, to step to the next digit of the bank
-        i = i + 1
-
-    joltage = int(''.join(selected_digits))
-    logger.debug(f'{joltage=} {selected_digits=}')
-    return joltage
+
+class BankIndex():
+    """Sparse table over a bank, to find the (leftmost) highest battery in any window in O(1).
+
+    Level j of the table holds, for every start position, the position of the highest
+    battery in the 2^j batteries from there. Any window is covered by two (overlapping)
+    blocks of the same level, so a lookup is just comparing two batteries.
+
+    Building takes O(n log n) once, after that the joltage for any k is k lookups,
+    instead of scanning the bank again.
+    """
+
+    def __init__(self, bank: str):
+        digits = np.frombuffer(bank.encode(), dtype=np.uint8)
+        self.bank = bank
+
+        # Level 0: every battery is the highest of its block of 1
+        # Levels stay NumPy int32, a list of Python ints per level takes ~30x the memory
+        levels = [np.arange(len(bank), dtype=np.int32)]
+        width = 1
+        while 2 * width <= len(bank):
+            previous = levels[-1]
+            left = previous[:len(previous) - width]
+            right = previous[width:]
+
+            # Left block wins ties, so the leftmost highest battery is kept
+            levels.append(np.where(digits[right] > digits[left], right, left))
+            width *= 2
+
+        self.levels = levels
+
+    def highest(self, start: int, end: int) -> int:
+        """Position of the (leftmost) highest battery between start and end (inclusive)
+
+        :param start: first position
+        :type start: int
+        :param end: last position
+        :type end: int
+        :return: position
+        :rtype: int
+        """
+        level = (end - start + 1).bit_length() - 1
+        left = int(self.levels[level][start])
+        right = int(self.levels[level][end - (1 << level) + 1])
+
+        if self.bank[right] > self.bank[left]:
+            return right
+        return left
+
+    def best(self, k: int) -> int:
+        """Largest joltage using k batteries, same as joltage_k
+
+        :param k: amount of batteries to select
+        :type k: int
+        :raises ValueError: when the bank doesn't have k batteries
+        :return: joltage
+        :rtype: int
+        """
+        if not 0 < k <= len(self.bank):
+            raise ValueError(f'Cannot select {k} batteries from a bank of {len(self.bank)}')
+
+        # Same "moving window" as before, with a lookup per window
+        i = 0
+        selected_digits = []
+        for end_index in range(len(self.bank) - k, len(self.bank)):
+            i = self.highest(i, end_index)
+            selected_digits.append(self.bank[i])
+            i += 1
+
+        return digits_to_int(''.join(selected_digits))
+
+    def profile(self, ks: list | None = None) -> dict:
+        """Largest joltage for a bunch of k's
+
+        :param ks: amount of batteries to try, defaults to all (1 up to the bank length)
+        :type ks: list | None
+        :return: joltage per k
+        :rtype: dict
+        """
+        if ks is None:
+            ks = range(1, len(self.bank) + 1)
+
+        return {k: self.best(k) for k in ks}
 
 
 def main(puzzle: list, part: int) -> int:
@@ -104,6 +214,144 @@ def main(puzzle: list, part: int) -> int:
     return sum(joltages)
 
 
+def joltages_batched(puzzle: list, k: int) -> np.ndarray:
+    """Determines the joltage of all banks at once, with NumPy. Same results as joltage_k.
+
+    Banks of the same length are put in a single matrix (one row per bank), then
+    the "moving window" way of selecting: for each of the k digits, find the (leftmost)
+    highest digit of every row between its last pick and the last possible position.
+    Earlier positions are masked out, so a single argmax per digit handles all rows.
+
+    :param puzzle: list of banks
+    :type puzzle: list
+    :param k: amount of batteries to select
+    :type k: int
+    :return: joltage per bank (int64, or Python ints when k > 18 as they won't fit)
+    :rtype: np.ndarray
+    """
+    joltages = np.zeros(len(puzzle), dtype=np.int64 if k <= 18 else object)
+
+    # Group banks by length
+    buckets = defaultdict(list)
+    for i, bank in enumerate(puzzle):
+        buckets[len(bank)].append(i)
+
+    for length, rows in buckets.items():
+        if not 0 < k <= length:
+            raise ValueError(f'Cannot select {k} batteries from a bank of {length}')
+
+        banks = np.frombuffer(''.join(puzzle[i] for i in rows).encode(), dtype=np.uint8)
+        banks = (banks - ord('0')).astype(np.int8).reshape(len(rows), length)
+
+        positions = np.zeros(len(rows), dtype=np.int64)
+        values = np.zeros(len(rows), dtype=joltages.dtype)
+        columns = np.arange(length)
+
+        for end_index in range(length - k, length):
+            # Only look from the leftmost position still needed, up to end_index
+            start = positions.min()
+            window = banks[:, start:end_index + 1]
+            window = np.where(columns[start:end_index + 1] < positions[:, None], -1, window)
+
+            picked = start + window.argmax(axis=1)
+            values = values * 10 + banks[np.arange(len(rows)), picked]
+            positions = picked + 1
+
+        joltages[rows] = values
+
+    return joltages
+
+
+def main_numpy(puzzle: list, part: int) -> int:
+    """Same as main, but handles all banks at once
+
+    :param puzzle: list of banks
+    :type puzzle: list
+    :param part: which part of the puzzle
+    :type part: int
+    :return: total joltage
+    :rtype: int
+    """
+    joltages = joltages_batched(puzzle, 2 if part == 1 else 12)
+    return int(joltages.sum())
+
+
+def iter_bank_views(filename: Path, chunk_size: int = 1 << 24):
+    """Memory-maps the input file, and yields each bank as a NumPy view into the file.
+
+    Nothing is copied: the views hold the raw ASCII digits, so the batteries still
+    compare the same way. Only the selected batteries need ord('0') subtracted.
+    Anything that's not a digit (newlines, commas) separates banks. These separators are
+    searched a chunk at a time, so memory use doesn't grow with the file size.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param chunk_size: amount of bytes to search for separators at once
+    :type chunk_size: int
+    :yield: bank data
+    :rtype: Iterator[np.ndarray]
+    """
+    with open(filename, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        data = np.frombuffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), dtype=np.uint8)
+
+    bank_start = 0
+    for offset in range(0, len(data), chunk_size):
+        chunk = data[offset:offset + chunk_size]
+        separators = np.flatnonzero((chunk < ord('0')) | (chunk > ord('9'))) + offset
+
+        for separator in separators.tolist():
+            if separator > bank_start:
+                yield data[bank_start:separator]
+            bank_start = separator + 1
+
+    if len(data) > bank_start:
+        yield data[bank_start:]
+
+
+def joltage_view(bank: np.ndarray, k: int) -> int:
+    """Same as joltage_k, for a bank view (ASCII digits, see iter_bank_views).
+
+    Uses the "moving window": for each battery the (leftmost) highest one between the
+    last pick and the last possible position. NumPy's argmax does the searching, so no
+    Python objects are made per battery.
+
+    :param bank: bank data
+    :type bank: np.ndarray
+    :param k: amount of batteries to select
+    :type k: int
+    :raises ValueError: when the bank doesn't have k batteries
+    :return: joltage
+    :rtype: int
+    """
+    if not 0 < k <= len(bank):
+        raise ValueError(f'Cannot select {k} batteries from a bank of {len(bank)}')
+
+    i = 0
+    joltage = 0
+    for end_index in range(len(bank) - k, len(bank)):
+        i += int(bank[i:end_index + 1].argmax())
+        joltage = 10 * joltage + int(bank[i]) - ord('0')
+        i += 1
+
+    return joltage
+
+
+def main_mmap(filename: Path, part: int) -> int:
+    """Same as main, but reads the banks straight from the memory-mapped file
+
+    :param filename: filename to read
+    :type filename: Path
+    :param part: which part of the puzzle
+    :type part: int
+    :return: total joltage
+    :rtype: int
+    """
+    k = 2 if part == 1 else 12
+    return sum(joltage_view(bank, k) for bank in iter_bank_views(filename))
+
+
 if __name__ == "__main__":  # pragma: no cover
     puzzle = read_input(Path("03/input.txt"))
     logger.info(f'Total part 1: {main(puzzle, 1)}')
@@ -0,0 +1,137 @@
+from day03 import (
+    BankIndex, digits_to_int, iter_bank_views, joltage, joltage2, joltage_k, joltage_view, joltages_batched, main_mmap,
+    main_numpy, read_input)
+from pathlib import Path
+from itertools import combinations
+import random
+import numpy as np
+import pytest
+
+
+def test_joltage_k_sample():
+    assert joltage_k('987654321111111', 2) == 98
+    assert joltage_k('818181911112111', 12) == 888911112111
+
+
+def test_joltage_k_all_digits():
+    assert joltage_k('12345', 5) == 12345
+    assert joltage_k('12345', 1) == 5
+    assert joltage_k('99999', 3) == 999
+
+
+def test_joltage_k_long():
+    # More digits than int() converts from a string, checked against joltage_view (no strings)
+    bank = '1234567890' * 1000
+    view = np.frombuffer(bank.encode(), dtype=np.uint8)
+    assert joltage_k(bank, 5000) == joltage_view(view, 5000)
+    assert joltage_k(bank, 10000) == joltage_view(view, 10000)
+
+
+def test_digits_to_int():
+    digits = '31415926535' * 1000
+    expected = 0
+    for digit in digits:
+        expected = 10 * expected + int(digit)
+    assert digits_to_int(digits) == expected
+    assert digits_to_int('007') == 7
+
+
+@pytest.mark.parametrize("k", [0, 6])
+def test_joltage_k_impossible(k):
+    with pytest.raises(ValueError):
+        joltage_k('12345', k)
+
+
+def test_joltage_k_brute_force():
+    random.seed(10)
+    for _ in range(200):
+        bank = ''.join(random.choice('123456789') for _ in range(random.randint(1, 10)))
+        k = random.randint(1, len(bank))
+        expected = max(int(''.join(c)) for c in combinations(bank, k))
+        assert joltage_k(bank, k) == expected
+
+
+def test_total_sample01_numpy():
+    puzzle = read_input(Path('03/sample01.txt'))
+    assert main_numpy(puzzle, 1) == 357
+    assert main_numpy(puzzle, 2) == 3121910778619
+
+
+def test_batched_ragged():
+    random.seed(11)
+    puzzle = [''.join(random.choice('123456789') for _ in range(random.choice([12, 15, 30]))) for _ in range(100)]
+    assert joltages_batched(puzzle, 2).tolist() == [joltage(bank) for bank in puzzle]
+    assert joltages_batched(puzzle, 12).tolist() == [joltage2(bank) for bank in puzzle]
+
+
+def test_batched_big_k():
+    # 20 digits don't fit in an int64
+    puzzle = ['9' * 25, '1234567890' * 3]
+    assert joltages_batched(puzzle, 20).tolist() == [joltage_k(bank, 20) for bank in puzzle]
+
+
+def test_batched_impossible():
+    with pytest.raises(ValueError):
+        joltages_batched(['12345', '123'], 4)
+
+
+def test_bank_index_sample():
+    index = BankIndex('818181911112111')
+    assert index.best(2) == 92
+    assert index.best(12) == 888911112111
+    assert index.profile([1, 15]) == {1: 9, 15: 818181911112111}
+
+
+def test_bank_index_leftmost():
+    index = BankIndex('3939')
+    assert index.highest(0, 3) == 1
+    assert index.highest(2, 3) == 3
+
+
+def test_bank_index_profile():
+    random.seed(12)
+    for _ in range(20):
+        bank = ''.join(random.choice('123456789') for _ in range(random.randint(1, 40)))
+        profile = BankIndex(bank).profile()
+        assert profile == {k: joltage_k(bank, k) for k in range(1, len(bank) + 1)}
+
+
+def test_bank_index_long():
+    bank = '1234567890' * 600
+    index = BankIndex(bank)
+    assert index.levels[-1].dtype == np.int32
+    assert index.profile([5000, 6000]) == {k: joltage_k(bank, k) for k in [5000, 6000]}
+
+
+def test_bank_index_impossible():
+    with pytest.raises(ValueError):
+        BankIndex('12345').best(6)
+
+
+def test_iter_bank_views(tmp_path):
+    filename = tmp_path / 'banks.txt'
+    filename.write_bytes(b'12345,678\r\n\n9876543210')
+
+    # Tiny chunks, so banks are spread over multiple chunks
+    banks = [bytes(bank).decode() for bank in iter_bank_views(filename, chunk_size=4)]
+    assert banks == ['12345', '678', '9876543210']
+
+
+def test_iter_bank_views_empty(tmp_path):
+    filename = tmp_path / 'banks.txt'
+    filename.write_bytes(b'')
+    assert list(iter_bank_views(filename)) == []
+
+
+def test_joltage_view():
+    random.seed(13)
+    for _ in range(100):
+        bank = ''.join(random.choice('123456789') for _ in range(random.randint(12, 40)))
+        view = np.frombuffer(bank.encode(), dtype=np.uint8)
+        assert joltage_view(view, 2) == joltage(bank)
+        assert joltage_view(view, 12) == joltage2(bank)
+
+
+def test_total_sample01_mmap():
+    assert main_mmap(Path('03/sample01.txt'), 1) == 357
+    assert main_mmap(Path('03/sample01.txt'), 2) == 3121910778619
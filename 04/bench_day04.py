@@ -0,0 +1,48 @@
+from pathlib import Path
+import logging
+import os
+import random
+import tempfile
+import time
+import coloredlogs
+import day04
+from day04 import main_numpy, main_tiled, read_input
+
+coloredlogs.install(level='INFO')
+logger = logging.getLogger(__name__)
+
+logging.getLogger(day04.__name__).setLevel(logging.WARNING)
+
+
+def generate_grid(filename: Path, size: int) -> None:
+    """Writes a random square grid of rolls
+
+    :param filename: filename to write
+    :type filename: Path
+    :param size: rows and columns
+    :type size: int
+    """
+    random.seed(2025)
+    with open(filename, "w") as f:
+        for _ in range(size):
+            f.write(''.join(random.choices('@@@.', k=size)) + '\n')
+
+
+def bench_tiled(size: int = 2000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = Path(tmp) / 'grid.txt'
+        generate_grid(filename, size)
+
+        start = time.perf_counter()
+        expected = main_numpy(read_input(filename))
+        logger.info(f'main_numpy: {time.perf_counter() - start:.3f} s, {expected} rolls removed')
+
+        for tile_size in (size // 8, size // 4, size // 2, size):
+            for processes in range(1, os.cpu_count() + 1):
+                start = time.perf_counter()
+                assert main_tiled(filename, tile_size, processes) == expected
+                logger.info(f'main_tiled {tile_size} tile, {processes} cores: {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == "__main__":  # pragma: no cover
+    bench_tiled()
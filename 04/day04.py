@@ -1,5 +1,9 @@
 from pathlib import Path
+import os
+import multiprocessing
+import tempfile
 import pygame
+import numpy as np
 import logging
 import coloredlogs
 
@@ -10,6 +14,10 @@ logger = logging.getLogger(__name__)
 SCALE = 4
 FPS = 5
 
+# Pixel colors for the renderer: empty, roll, roll to be removed
+BACKGROUND = (10, 20, 10)
+PALETTE = np.array([BACKGROUND, (32, 255, 63), (127, 255, 63)], dtype=np.uint8)
+
 
 def read_input(filename: Path) -> list:
     """Reads from input file, strips newline characters
@@ -128,25 +136,32 @@ def main(puzzle: list, SHOW: bool = True) -> int:
 
     Loops over the puzzle grid, untill no more rolls can be removed
 
-    :param puzzle: Puzzle map
+    A Bitboard can be passed in as puzzle as well. Without pygame window it's solved
+    as bitboard, otherwise it's converted to a map first (it needs to be drawn anyway).
+
+    :param puzzle: Puzzle map (or Bitboard)
     :type puzzle: list
     :param SHOW: Whether to show pygame window
     :type SHOW: bool
     :return: Amount of rolls removed in total
     :rtype: int
     """
+    if isinstance(puzzle, Bitboard):
+        if not SHOW:
+            return main_bitboard(puzzle)
+        puzzle = puzzle.to_grid()  # pragma: no cover
+
     # Set up pygame
     if SHOW:  # pragma: no cover
         pygame.init()
-        pygame.font.init()
         timert = pygame.time.Clock()
-        font = pygame.font.SysFont('freemono', size=SCALE)
         size_x = SCALE * len(puzzle[0])
         size_y = SCALE * len(puzzle)
         screen = pygame.display.set_mode([size_x, size_y])
 
-        # Draw map on screen
-        draw_map(screen, font, puzzle)
+        # Draw map on screen, after that only the removed rolls are redrawn
+        renderer = GridRenderer(screen)
+        renderer.draw(to_array(puzzle).astype(np.uint8))
 
         # Update display
         pygame.display.flip()
@@ -158,11 +173,10 @@ def main(puzzle: list, SHOW: bool = True) -> int:
     while len(to_be_removed := count_neighbours(puzzle)) > 0:
         if SHOW:  # pragma: no cover
             # For game animation: show which rolls are to be removed
-            for x, y in to_be_removed:
-                puzzle[y][x] = "x"
+            xs, ys = np.array(list(to_be_removed)).T
+            renderer.update(ys, xs, 2)
 
             # Update screen
-            draw_map(screen, font, puzzle)
             pygame.display.flip()
             timert.tick(FPS)
 
@@ -176,7 +190,7 @@ def main(puzzle: list, SHOW: bool = True) -> int:
 
         if SHOW:  # pragma: no cover
             # Draw map on screen
-            draw_map(screen, font, puzzle)
+            renderer.update(ys, xs, 0)
             pygame.display.flip()
             timert.tick(FPS)
 
@@ -193,6 +207,485 @@ def main(puzzle: list, SHOW: bool = True) -> int:
     return total_removed
 
 
+def to_array(puzzle: list) -> np.ndarray:
+    """Converts the puzzle map into a boolean array, True where there's a roll
+
+    :param puzzle: Puzzle map
+    :type puzzle: list
+    :return: Rolls
+    :rtype: np.ndarray
+    """
+    return np.array(puzzle, dtype='U1') == '@'
+
+
+def neighbour_counts(grid: np.ndarray) -> np.ndarray:
+    """Counts the rolls around each cell, all cells at once
+
+    The grid is padded with a border of empty cells, then shifted in all 8
+    directions and added up. No boundary checks needed.
+
+    :param grid: Rolls
+    :type grid: np.ndarray
+    :return: Amount of neighbouring rolls for each cell
+    :rtype: np.ndarray
+    """
+    rows, cols = grid.shape
+    padded = np.pad(grid, 1).astype(np.uint8)
+
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy == 1 and dx == 1:
+                continue
+            counts += padded[dy:dy + rows, dx:dx + cols]
+
+    return counts
+
+
+def count_neighbours_numpy(grid: np.ndarray) -> tuple[np.ndarray, set]:
+    """NumPy version of count_neighbours: rolls with less than 4 neighbours can be removed
+
+    :param grid: Rolls
+    :type grid: np.ndarray
+    :return: Mask of rolls to be removed, and their (x, y) coordinates
+    :rtype: tuple[np.ndarray, set]
+    """
+    accessable = grid & (neighbour_counts(grid) < 4)
+
+    ys, xs = np.nonzero(accessable)
+    return accessable, set(zip(xs.tolist(), ys.tolist()))
+
+
+def main_numpy(puzzle: list) -> int:
+    """Same as main (without the pygame window), using the NumPy grid
+
+    :param puzzle: Puzzle map
+    :type puzzle: list
+    :return: Amount of rolls removed in total
+    :rtype: int
+    """
+    grid = to_array(puzzle)
+    total_removed = 0
+
+    while True:
+        to_be_removed = grid & (neighbour_counts(grid) < 4)
+        removed = int(to_be_removed.sum())
+        if removed == 0:
+            break
+
+        grid &= ~to_be_removed
+
+        total_removed += removed
+        logger.info(f'Amount rolls removed: {removed}, {total_removed=}')
+
+    return total_removed
+
+
+def peel(puzzle: list) -> tuple[int, list, np.ndarray]:
+    """Removes the rolls wave after wave (like main), without rescanning the whole grid each wave.
+
+    Neighbour counts are only calculated once. When a roll is removed, only its neighbours
+    lose a neighbour. A roll whose count drops to 3 becomes removable in the next wave, so
+    only those are put on the work list. Every roll is removed at most once and has 8 neighbours,
+    so the total work is O(cells) instead of O(waves * cells).
+
+    The grid is padded with a border of empty cells and flattened, so neighbours are
+    just fixed offsets, without boundary checks.
+
+    :param puzzle: Puzzle map
+    :type puzzle: list
+    :return: Amount of rolls removed in total, amount per wave, and a map with the wave
+        each roll got removed in (starting at 1, 0 if never removed)
+    :rtype: tuple[int, list, np.ndarray]
+    """
+    grid = np.pad(to_array(puzzle), 1)
+    rows, cols = grid.shape
+
+    present = grid.ravel().tolist()
+    counts = neighbour_counts(grid).ravel().tolist()
+    removed_in = [0] * len(present)
+
+    offsets = [dy * cols + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+
+    # First wave: all rolls with less than 4 neighbours
+    to_be_removed = np.flatnonzero(grid.ravel() & (np.array(counts) < 4)).tolist()
+    removed_per_wave = []
+
+    while to_be_removed:
+        wave = len(removed_per_wave) + 1
+        removed_per_wave.append(len(to_be_removed))
+
+        # Remove first, so rolls removed in this wave aren't scheduled again
+        for cell in to_be_removed:
+            present[cell] = False
+            removed_in[cell] = wave
+
+        next_wave = []
+        for cell in to_be_removed:
+            for offset in offsets:
+                neighbour = cell + offset
+                if present[neighbour]:
+                    counts[neighbour] -= 1
+                    if counts[neighbour] == 3:
+                        next_wave.append(neighbour)
+
+        logger.debug(f'Wave {wave}: {len(to_be_removed)} rolls removed')
+        to_be_removed = next_wave
+
+    total_removed = sum(removed_per_wave)
+    logger.info(f'Removed {total_removed} rolls in {len(removed_per_wave)} waves')
+
+    waves = np.array(removed_in, dtype=np.int32).reshape(rows, cols)[1:-1, 1:-1]
+
+    return total_removed, removed_per_wave, waves
+
+
+class Bitboard():
+    """Compact puzzle map: each row is a Python int, with bit j set when there's a roll in column j.
+
+    One bit per cell instead of a list entry with a one-character string, and
+    Python ints can be any length, so a whole row is handled in a single operation.
+    """
+
+    def __init__(self, rows: list, width: int):
+        self.rows = rows
+        self.width = width
+
+    @classmethod
+    def from_grid(cls, puzzle: list) -> 'Bitboard':
+        # Reversed, so column 0 ends up as the lowest bit
+        rows = [int(''.join('1' if c == '@' else '0' for c in reversed(line)), 2) for line in puzzle]
+        return cls(rows, len(puzzle[0]) if puzzle else 0)
+
+    def to_grid(self) -> list:
+        return [['@' if row >> j & 1 else '.' for j in range(self.width)] for row in self.rows]
+
+
+def read_bitboard(filename: Path) -> Bitboard:
+    """Reads from input file straight into a Bitboard, line by line
+
+    :param filename: filename to read
+    :type filename: Path
+    :return: puzzle map
+    :rtype: Bitboard
+    """
+    to_bits = str.maketrans('@.', '10')
+    rows = []
+    width = 0
+
+    with open(filename, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rows.append(int(line.translate(to_bits)[::-1], 2))
+                width = max(width, len(line))
+
+    return Bitboard(rows, width)
+
+
+def removable_rows(board: Bitboard) -> list:
+    """Bitboard version of count_neighbours: finds the rolls with less than 4 neighbours
+
+    For each row, the 8 neighbours are the rows above, below and the row itself,
+    shifted one bit left and right. These are added up, bit-wise, with a small adder:
+    two bits counting 0-3 and a third bit which is set (and stays set) once the
+    count overflows to 4. So the whole row is counted at once, instead of cell by cell.
+
+    :param board: puzzle map
+    :type board: Bitboard
+    :return: rolls to be removed, a bit mask per row
+    :rtype: list
+    """
+    full = (1 << board.width) - 1
+    rows = [0] + board.rows + [0]
+
+    removable = []
+    for above, row, below in zip(rows, rows[1:], rows[2:]):
+        neighbours = [
+            above << 1 & full, above, above >> 1,
+            row << 1 & full, row >> 1,
+            below << 1 & full, below, below >> 1]
+
+        ones = twos = four_or_more = 0
+        for n in neighbours:
+            carry = ones & n
+            ones ^= n
+            four_or_more |= twos & carry
+            twos ^= carry
+
+        removable.append(row & ~four_or_more)
+
+    return removable
+
+
+def main_bitboard(board: Bitboard) -> int:
+    """Same as main (without the pygame window), for a Bitboard
+
+    :param board: puzzle map
+    :type board: Bitboard
+    :return: Amount of rolls removed in total
+    :rtype: int
+    """
+    total_removed = 0
+
+    while True:
+        to_be_removed = removable_rows(board)
+        removed = sum(row.bit_count() for row in to_be_removed)
+        if removed == 0:
+            break
+
+        board.rows = [row & ~remove for row, remove in zip(board.rows, to_be_removed)]
+
+        total_removed += removed
+        logger.info(f'Amount rolls removed: {removed}, {total_removed=}')
+
+    return total_removed
+
+
+def grid_to_memmap(filename: Path, path: Path) -> tuple[int, int]:
+    """Converts the puzzle input into a memory-mapped file with a byte per cell (1 for a roll).
+
+    Reads the input line by line (twice: once to find the size), so the grid
+    never needs to fit in memory.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param path: memory-mapped file to write
+    :type path: Path
+    :return: rows and columns of the grid
+    :rtype: tuple[int, int]
+    """
+    rows, cols = 0, 0
+    with open(filename, "rb") as f:
+        for line in f:
+            if line.strip():
+                rows += 1
+                cols = max(cols, len(line.strip()))
+
+    state = np.memmap(path, dtype=np.uint8, mode='w+', shape=(rows, cols))
+    with open(filename, "rb") as f:
+        row = 0
+        for line in f:
+            line = line.strip()
+            if line:
+                state[row, :len(line)] = np.frombuffer(line, dtype=np.uint8) == ord('@')
+                row += 1
+
+    state.flush()
+    del state
+
+    return rows, cols
+
+
+# Memory-mapped grid and removal mask, opened once in every worker process of main_tiled
+tile_state = None
+tile_removed = None
+
+
+def open_tile_state(path: Path, removed_path: Path, shape: tuple[int, int]) -> None:
+    global tile_state, tile_removed
+    tile_state = np.memmap(path, dtype=np.uint8, mode='r', shape=shape)
+    tile_removed = np.memmap(removed_path, dtype=np.uint8, mode='r+', shape=shape)
+
+
+def tile_removals(tile: tuple[int, int, int, int]) -> int:
+    """Worker for main_tiled: finds the removable rolls of a single tile
+
+    The tile is read with a halo of one cell around it, so the rolls at the tile edges
+    see all their neighbours. The rolls to be removed are written to the removal mask
+    (for the cells of the tile itself), the grid is not changed.
+
+    :param tile: first row, last row (excluded), first column, last column (excluded)
+    :type tile: tuple[int, int, int, int]
+    :return: amount of rolls to be removed
+    :rtype: int
+    """
+    r0, r1, c0, c1 = tile
+    rows, cols = tile_state.shape
+
+    # Tile plus halo, clipped at the grid edges
+    h0, h1 = max(r0 - 1, 0), min(r1 + 1, rows)
+    w0, w1 = max(c0 - 1, 0), min(c1 + 1, cols)
+    block = np.array(tile_state[h0:h1, w0:w1], dtype=bool)
+
+    to_be_removed = block & (neighbour_counts(block) < 4)
+    to_be_removed = to_be_removed[r0 - h0:r1 - h0, c0 - w0:c1 - w0]
+
+    tile_removed[r0:r1, c0:c1] = to_be_removed
+
+    return int(to_be_removed.sum())
+
+
+def main_tiled(filename: Path, tile_size: int = 1024, processes: int | None = None,
+               work_dir: Path | None = None) -> int:
+    """Same as main (without the pygame window), for grids too large for memory
+
+    The grid is kept in a memory-mapped file, and split into tiles which are handled
+    by a pool of processes. Every wave, the workers only mark which rolls to remove, in a second
+    memory-mapped file (the removal mask). After that the main process removes them from the grid,
+    a tile at a time, so it never holds more than a tile in memory. That way all tiles of a wave see
+    the same grid, just like main. The workers see the changes in the memory-mapped file, so
+    that's how the tile borders get exchanged.
+    A tile can only change when something was removed in it, or next to it, in the previous wave,
+    so only those tiles are handed out again. Done when no tile removes anything.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param tile_size: rows and columns of a tile
+    :type tile_size: int
+    :param processes: amount of processes, defaults to cpu count
+    :type processes: int | None
+    :param work_dir: directory for the memory-mapped files (twice the grid size), defaults to the
+        directory of the input file, as the default temp directory might be in memory (tmpfs)
+    :type work_dir: Path | None
+    :return: Amount of rolls removed in total
+    :rtype: int
+    """
+    processes = processes or os.cpu_count()
+    total_removed = 0
+
+    with tempfile.TemporaryDirectory(dir=work_dir or Path(filename).parent) as tmp:
+        path = Path(tmp) / 'grid.bin'
+        removed_path = Path(tmp) / 'removed.bin'
+        shape = grid_to_memmap(filename, path)
+        rows, cols = shape
+        if rows == 0:
+            return 0
+
+        tile_rows = range(0, rows, tile_size)
+        tile_cols = range(0, cols, tile_size)
+        active = {(i, j) for i in range(len(tile_rows)) for j in range(len(tile_cols))}
+
+        state = np.memmap(path, dtype=np.uint8, mode='r+', shape=shape)
+        # Only the tiles handed out in a wave are written and read back, so no need to clear it
+        removal_mask = np.memmap(removed_path, dtype=np.uint8, mode='w+', shape=shape)
+
+        with multiprocessing.Pool(processes=processes, initializer=open_tile_state,
+                                  initargs=(path, removed_path, shape)) as pool:
+            while active:
+                tiles = sorted(active)
+                args_list = [(tile_rows[i], min(tile_rows[i] + tile_size, rows),
+                              tile_cols[j], min(tile_cols[j] + tile_size, cols)) for i, j in tiles]
+                results = pool.map(tile_removals, args_list)
+
+                # Remove the rolls, and find the tiles to handle in the next wave
+                removed = 0
+                active = set()
+                for (i, j), (r0, r1, c0, c1), amount in zip(tiles, args_list, results):
+                    if amount == 0:
+                        continue
+                    state[r0:r1, c0:c1] &= removal_mask[r0:r1, c0:c1] ^ 1
+                    removed += amount
+                    active |= {(i + di, j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                               if 0 <= i + di < len(tile_rows) and 0 <= j + dj < len(tile_cols)}
+
+                if removed == 0:
+                    break
+
+                state.flush()
+                total_removed += removed
+                logger.info(f'Amount rolls removed: {removed}, {total_removed=}, {len(active)} tiles active')
+
+        del state, removal_mask
+
+    return total_removed
+
+
+class GridRenderer():
+    """Draws the grid straight into the pixels of a surface, instead of a font glyph per cell.
+
+    A full draw maps the grid state (0 empty, 1 roll, 2 to be removed) through the palette
+    and scales it up, all in NumPy. After that, only the cells that changed are redrawn.
+    """
+
+    def __init__(self, surface: pygame.Surface, scale: int = SCALE):
+        self.surface = surface
+        self.scale = scale
+
+    def draw(self, state: np.ndarray) -> None:
+        # surfarray is indexed (x, y), so transpose
+        pixels = PALETTE[state.T].repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        pygame.surfarray.blit_array(self.surface, pixels)
+
+    def update(self, ys: np.ndarray, xs: np.ndarray, value: int) -> None:
+        # Only redraw the dirty cells, straight into the pixels of the surface.
+        # Viewed as (x, dx, y, dy, color), a cell is a single index into x and y.
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        width, height = pixels.shape[0] // self.scale, pixels.shape[1] // self.scale
+        cells = pixels[:width * self.scale, :height * self.scale].reshape(width, self.scale, height, self.scale, 3)
+        cells[xs, :, ys, :] = PALETTE[value]
+        del cells, pixels  # unlocks the surface
+
+
+def render_animation(puzzle: list, output: Path, scale: int = SCALE, raw: bool = False) -> int:
+    """Renders all waves of roll removal to image files, without a window and without waiting for FPS.
+
+    Same frames as main shows: the start, and per wave the rolls to be removed marked, then removed.
+    The waves come from peel, so the grid isn't recalculated for every frame.
+
+    Frames go to a PNG sequence (frame_00000.png, ...) in the output directory, or when raw is
+    set, all frames are written as RGB bytes to a single file. That's a raw video stream, for example
+    for: ffmpeg -f rawvideo -pix_fmt rgb24 -s <width>x<height> -i frames.rgb animation.mp4
+
+    :param puzzle: Puzzle map
+    :type puzzle: list
+    :param output: directory for PNG files, or the file for raw frames
+    :type output: Path
+    :param scale: pixels per cell
+    :type scale: int
+    :param raw: write raw RGB frames instead of PNG files
+    :type raw: bool
+    :return: amount of frames written
+    :rtype: int
+    """
+    # No window needed, but make sure SDL doesn't go look for a display
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    _, removed_per_wave, waves = peel(puzzle)
+    state = to_array(puzzle).astype(np.uint8)
+
+    # Cells sorted by wave, so each wave is a slice
+    order = np.argsort(waves.ravel(), kind='stable')
+    first_cell = np.searchsorted(waves.ravel()[order], np.arange(1, len(removed_per_wave) + 2))
+
+    surface = pygame.Surface((scale * state.shape[1], scale * state.shape[0]))
+    renderer = GridRenderer(surface, scale)
+    renderer.draw(state)
+
+    if raw:
+        stream = open(output, "wb")
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+
+    frames = 0
+
+    def write_frame():
+        nonlocal frames
+        if raw:
+            stream.write(pygame.image.tobytes(surface, 'RGB'))
+        else:
+            pygame.image.save(surface, str(output / f'frame_{frames:05d}.png'))
+        frames += 1
+
+    try:
+        write_frame()
+        for wave in range(len(removed_per_wave)):
+            ys, xs = np.divmod(order[first_cell[wave]:first_cell[wave + 1]], state.shape[1])
+
+            # Mark rolls to be removed, then remove them
+            renderer.update(ys, xs, 2)
+            write_frame()
+            renderer.update(ys, xs, 0)
+            write_frame()
+    finally:
+        if raw:
+            stream.close()
+
+    logger.info(f'Rendered {frames} frames to {output}')
+
+    return frames
+
+
 if __name__ == "__main__":  # pragma: no cover
     # puzzle = read_input(Path("04/sample01.txt"))
     puzzle = read_input(Path("04/input.txt"))
@@ -1,5 +1,8 @@
 from pathlib import Path
-from day04 import read_input, count_neighbours, main, draw_map
+from day04 import read_input, count_neighbours, main, draw_map, count_neighbours_numpy, main_numpy, to_array, peel
+from day04 import Bitboard, read_bitboard, removable_rows, grid_to_memmap, main_tiled, GridRenderer, render_animation
+import random
+import numpy as np
 import pytest
 
 import os
@@ -37,3 +40,147 @@ def test_draw_map(sample_puzzle):
     draw_map(screen, font, sample_puzzle)
 
     pygame.quit()
+
+
+def test_count_neighbours_numpy(sample_puzzle):
+    accessable, coords = count_neighbours_numpy(to_array(sample_puzzle))
+
+    assert coords == count_neighbours(sample_puzzle)
+    assert accessable.sum() == 13
+
+
+def test_main_numpy(sample_puzzle):
+    assert main_numpy(sample_puzzle) == 43
+
+
+def test_main_numpy_random():
+    random.seed(14)
+    puzzle = [[random.choice('@@.') for _ in range(25)] for _ in range(25)]
+    assert main_numpy(puzzle) == main([row[:] for row in puzzle], SHOW=False)
+
+
+def test_peel(sample_puzzle):
+    total_removed, removed_per_wave, waves = peel(sample_puzzle)
+
+    assert total_removed == 43
+    assert removed_per_wave[0] == 13
+    assert sum(removed_per_wave) == total_removed
+    assert [(waves == i + 1).sum() for i in range(len(removed_per_wave))] == removed_per_wave
+
+
+def test_peel_matches_waves():
+    random.seed(15)
+    puzzle = [[random.choice('@@@.') for _ in range(25)] for _ in range(25)]
+    total_removed, removed_per_wave, waves = peel(puzzle)
+
+    # Replay the waves with count_neighbours
+    for wave, removed in enumerate(removed_per_wave, start=1):
+        to_be_removed = count_neighbours(puzzle)
+        assert len(to_be_removed) == removed
+        assert to_be_removed == {(x, y) for y, x in zip(*(waves == wave).nonzero())}
+        for x, y in to_be_removed:
+            puzzle[y][x] = "."
+
+    assert count_neighbours(puzzle) == set()
+
+
+def test_bitboard_conversion(sample_puzzle):
+    board = Bitboard.from_grid(sample_puzzle)
+    assert board.to_grid() == sample_puzzle
+    assert read_bitboard(Path("04/sample01.txt")).rows == board.rows
+
+
+def test_removable_rows(sample_puzzle):
+    removable = removable_rows(Bitboard.from_grid(sample_puzzle))
+    coords = {(x, y) for y, row in enumerate(removable) for x in range(len(sample_puzzle[0])) if row >> x & 1}
+    assert coords == count_neighbours(sample_puzzle)
+
+
+def test_main_bitboard():
+    assert main(read_bitboard(Path("04/sample01.txt")), SHOW=False) == 43
+
+    random.seed(16)
+    puzzle = [[random.choice('@@.') for _ in range(70)] for _ in range(30)]
+    assert main(Bitboard.from_grid(puzzle), SHOW=False) == main_numpy(puzzle)
+
+
+def test_grid_to_memmap(tmp_path, sample_puzzle):
+    shape = grid_to_memmap(Path("04/sample01.txt"), tmp_path / 'grid.bin')
+    state = np.memmap(tmp_path / 'grid.bin', dtype=np.uint8, mode='r', shape=shape)
+    assert np.array_equal(state, to_array(sample_puzzle))
+
+
+@pytest.mark.parametrize("tile_size", [3, 4, 100])
+def test_main_tiled(tile_size):
+    assert main_tiled(Path("04/sample01.txt"), tile_size=tile_size, processes=2) == 43
+
+
+def test_main_tiled_work_dir(tmp_path):
+    assert main_tiled(Path("04/sample01.txt"), tile_size=4, processes=1, work_dir=tmp_path) == 43
+    # Temporary files are cleaned up again
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_main_tiled_random(tmp_path):
+    random.seed(17)
+    puzzle = [[random.choice('@@@.') for _ in range(40)] for _ in range(40)]
+    filename = tmp_path / 'grid.txt'
+    filename.write_text('\n'.join(''.join(line) for line in puzzle))
+
+    assert main_tiled(filename, tile_size=7, processes=2) == main(puzzle, SHOW=False)
+
+
+def test_render_animation_png(tmp_path, sample_puzzle):
+    frames = render_animation(sample_puzzle, tmp_path / 'frames', scale=2)
+    _, removed_per_wave, _ = peel(sample_puzzle)
+
+    assert frames == 1 + 2 * len(removed_per_wave)
+    assert len(list((tmp_path / 'frames').glob('frame_*.png'))) == frames
+
+
+def test_render_animation_raw(tmp_path, sample_puzzle):
+    import pygame
+
+    frames = render_animation(sample_puzzle, tmp_path / 'frames.rgb', scale=2, raw=True)
+    data = (tmp_path / 'frames.rgb').read_bytes()
+    frame_size = 20 * 20 * 3
+    assert len(data) == frames * frame_size
+
+    # Last frame: only the rolls that could not be removed are left
+    last = pygame.image.frombytes(data[-frame_size:], (20, 20), 'RGB')
+    grid = to_array(sample_puzzle)
+    _, _, waves = peel(sample_puzzle)
+    left = grid & (waves == 0)
+    for y in range(10):
+        for x in range(10):
+            expected = (32, 255, 63) if left[y, x] else (10, 20, 10)
+            assert tuple(last.get_at((2 * x, 2 * y)))[:3] == expected
+
+
+def test_grid_renderer_matches_draw(sample_puzzle):
+    import pygame
+
+    surface = pygame.Surface((10, 10))
+    renderer = GridRenderer(surface, scale=1)
+    state = to_array(sample_puzzle).astype(np.uint8)
+    renderer.draw(state)
+    renderer.update(np.array([0]), np.array([2]), 2)
+
+    assert tuple(surface.get_at((2, 0)))[:3] == (127, 255, 63)
+    assert tuple(surface.get_at((0, 0)))[:3] == (10, 20, 10)
+
+
+def test_grid_renderer_update_scaled(sample_puzzle):
+    import pygame
+
+    state = to_array(sample_puzzle).astype(np.uint8)
+    ys, xs = np.nonzero(state)
+    surface = pygame.Surface((3 * state.shape[1], 3 * state.shape[0]))
+    renderer = GridRenderer(surface, scale=3)
+    renderer.draw(state)
+    renderer.update(ys[::2], xs[::2], 2)
+
+    expected = pygame.Surface(surface.get_size())
+    state[ys[::2], xs[::2]] = 2
+    GridRenderer(expected, scale=3).draw(state)
+    assert (pygame.surfarray.array3d(surface) == pygame.surfarray.array3d(expected)).all()
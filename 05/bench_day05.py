@@ -0,0 +1,44 @@
+import logging
+import time
+import coloredlogs
+import numpy as np
+import day05
+from day05 import part1, part1_numpy
+
+coloredlogs.install(level='INFO')
+logger = logging.getLogger(__name__)
+
+logging.getLogger(day05.__name__).setLevel(logging.WARNING)
+
+
+def generate_puzzle(n_ranges: int, n_IDs: int, max_ID: int = 10 ** 14) -> tuple[list, np.ndarray]:
+    """Random fresh ID ranges and available IDs
+
+    :param n_ranges: amount of ranges
+    :type n_ranges: int
+    :param n_IDs: amount of IDs
+    :type n_IDs: int
+    :param max_ID: highest ID
+    :type max_ID: int
+    :return: fresh ID ranges and available IDs
+    :rtype: tuple[list, np.ndarray]
+    """
+    rng = np.random.default_rng(2025)
+    starts = rng.integers(0, max_ID, n_ranges)
+    lengths = rng.integers(0, max_ID // n_ranges, n_ranges)
+    fresh_ID_ranges = np.stack([starts, starts + lengths], axis=1).tolist()
+    available_IDs = rng.integers(0, max_ID, n_IDs)
+    return fresh_ID_ranges, available_IDs
+
+
+def bench_part1(n_ranges: int = 10 ** 5, n_IDs: int = 10 ** 7) -> None:
+    fresh_ID_ranges, available_IDs = generate_puzzle(n_ranges, n_IDs)
+    for label, func, ids in [('part1', part1, available_IDs.tolist()), ('part1_numpy', part1_numpy, available_IDs)]:
+        start = time.perf_counter()
+        valid = func(fresh_ID_ranges, ids)
+        duration = time.perf_counter() - start
+        logger.info(f'{label:<12} {duration:8.3f} s {n_IDs / duration / 1e6:8.2f} M IDs/s  -> {valid} valid')
+
+
+if __name__ == "__main__":  # pragma: no cover
+    bench_part1()
@@ -1,8 +1,13 @@
 from pathlib import Path
 import logging
 import coloredlogs
-from tqdm import tqdm
+from bisect import bisect_left, bisect_right
+import heapq
+from itertools import islice
+import tempfile
 import pprint
+import numpy as np
+from sortedcontainers import SortedList
 
 coloredlogs.install(level='INFO')
 logger = logging.getLogger(__name__)
@@ -78,13 +83,11 @@ def part1(fresh_ID_ranges: list, available_IDs: list) -> int:
     :rtype: int
     """
 
-    # Collect valid IDs
-    valid_IDs = []
+    # Build the index once, instead of checking all ranges for every ID
+    index = IntervalIndex(fresh_ID_ranges)
 
-    # Loop over available IDs and check if they are valid
-    for ingredient_ID in tqdm(available_IDs):
-        if check_ID(ingredient_ID, fresh_ID_ranges):
-            valid_IDs.append(ingredient_ID)
+    # Collect valid IDs
+    valid_IDs = [ingredient_ID for ingredient_ID in available_IDs if ingredient_ID in index]
 
     logger.debug(f"Valid IDs: {valid_IDs}")
     logger.debug(f"Number of valid IDs: {len(valid_IDs)}")
@@ -92,21 +95,22 @@ def part1(fresh_ID_ranges: list, available_IDs: list) -> int:
     return len(valid_IDs)
 
 
-def part2(fresh_ID_ranges: list):
-    """
-    Part 2 is way more difficult. This is because we cannot check each ID within min/max range
-    of fresh_ID_ranges, as that would be too slow. Believe me, I tried.
-
-    So we need to combine overlapping ranges first, then count the total number of IDs in the combined ranges.
+def merge_ranges(fresh_ID_ranges: list) -> list:
+    """Combines overlapping ranges
 
     First sort the ranges by their starting ID.
     Then start checking adjacent ranges for overlap.
     If they overlap, combine them into a single range.
     If they don't overlap, add the current range to the list of combined ranges.
 
-    :param fresh_ID_ranges: Description
+    :param fresh_ID_ranges: Ranges of valid IDs
     :type fresh_ID_ranges: list
+    :return: Sorted, non-overlapping ranges
+    :rtype: list
     """
+    if not fresh_ID_ranges:
+        return []
+
     # Sort here
     ranges = sorted(fresh_ID_ranges)
 
@@ -115,7 +119,7 @@ def part2(fresh_ID_ranges: list):
     combined_ranges = [ranges[0]]
 
     # Loop over the remaining ranges
-    for current_range in tqdm(ranges[1:]):
+    for current_range in ranges[1:]:
         # Get the last range
         last_range = combined_ranges[-1]
 
@@ -140,6 +144,72 @@ def part2(fresh_ID_ranges: list):
 
     logger.debug(f"Combined ranges: {combined_ranges}")
 
+    return combined_ranges
+
+
+class IntervalIndex():
+    """Fresh ID ranges, combined and sorted, to look up IDs with bisect.
+
+    As the combined ranges don't overlap, both the starts and the ends are sorted.
+    The only range an ID can be in is the last one starting at or before the ID.
+    """
+
+    def __init__(self, fresh_ID_ranges: list):
+        combined_ranges = merge_ranges(fresh_ID_ranges)
+        self.starts = [start for start, _ in combined_ranges]
+        self.ends = [end for _, end in combined_ranges]
+
+    def __contains__(self, ingredient_ID: int) -> bool:
+        i = bisect_right(self.starts, ingredient_ID) - 1
+        return i >= 0 and ingredient_ID <= self.ends[i]
+
+
+def part1_numpy(fresh_ID_ranges: list, available_IDs, return_mask: bool = False):
+    """Same as part1, but checks all IDs at once with NumPy.
+
+    Like IntervalIndex: the combined ranges are sorted, so searchsorted finds the
+    only range each ID could be in (the last one starting at or before the ID),
+    then it's just comparing with the end of that range.
+
+    :param fresh_ID_ranges: Ranges of valid IDs
+    :type fresh_ID_ranges: list
+    :param available_IDs: Available IDs to check (list or int64 array)
+    :type available_IDs: list | np.ndarray
+    :param return_mask: also return which IDs are valid
+    :type return_mask: bool
+    :return: Amount of valid IDs, and the mask of valid IDs when return_mask is set
+    :rtype: int | tuple[int, np.ndarray]
+    """
+    ids = np.asarray(available_IDs, dtype=np.int64)
+
+    combined_ranges = np.array(merge_ranges(fresh_ID_ranges), dtype=np.int64).reshape(-1, 2)
+    starts, ends = combined_ranges[:, 0], combined_ranges[:, 1]
+
+    # IDs before the first range get i = -1, those are never valid
+    i = np.searchsorted(starts, ids, side='right') - 1
+    valid = (i >= 0) & (ids <= ends[np.maximum(i, 0)]) if len(starts) else np.zeros(len(ids), dtype=bool)
+
+    count = int(valid.sum())
+    logger.debug(f"Number of valid IDs: {count}")
+
+    if return_mask:
+        return count, valid
+    return count
+
+
+def part2(fresh_ID_ranges: list):
+    """
+    Part 2 is way more difficult. This is because we cannot check each ID within min/max range
+    of fresh_ID_ranges, as that would be too slow. Believe me, I tried.
+
+    So we need to combine overlapping ranges first (see merge_ranges),
+    then count the total number of IDs in the combined ranges.
+
+    :param fresh_ID_ranges: Description
+    :type fresh_ID_ranges: list
+    """
+    combined_ranges = merge_ranges(fresh_ID_ranges)
+
     # Now count the total number of IDs in the combined ranges
     total_IDs = 0
     for start, end in combined_ranges:
@@ -150,6 +220,328 @@ def part2(fresh_ID_ranges: list):
     return total_IDs
 
 
+class IntervalSet():
+    """Set of fresh IDs, stored as ranges, which can change over time.
+
+    Same idea as IntervalIndex (sorted, non-overlapping ranges), but ranges can be added
+    and removed. Adding a range swallows the ranges it overlaps (or touches), removing a range
+    cuts the ranges it overlaps, splitting them when needed.
+    The total number of fresh IDs is updated along the way, so it's always the same as
+    part2 of the current ranges, without merging everything again.
+
+    The ranges are kept in a SortedList (a list of sorted blocks), so finding, inserting and
+    deleting a range are all O(log n), no shifting of one long list. Every range is swallowed at
+    most once after being added, so the updates are O(log n) amortised.
+    """
+
+    def __init__(self, fresh_ID_ranges: list | None = None):
+        # Build all at once: sort, then combine overlapping and touching ranges in a single pass
+        combined_ranges = []
+        for start, end in sorted(map(tuple, fresh_ID_ranges or [])):
+            if start > end:
+                raise ValueError(f'Invalid range {start}-{end}')
+            if combined_ranges and start <= combined_ranges[-1][1] + 1:
+                combined_ranges[-1] = (combined_ranges[-1][0], max(end, combined_ranges[-1][1]))
+            else:
+                combined_ranges.append((start, end))
+
+        self.sorted_ranges = SortedList(combined_ranges)
+        self.count = sum(end - start + 1 for start, end in combined_ranges)
+
+    def _affected(self, start: int, end: int) -> tuple[int, int]:
+        # Positions lo up to hi (excluded) of the ranges ending at start or later,
+        # and starting at end or earlier. (x,) sorts before every range starting at x.
+        lo = self.sorted_ranges.bisect_left((start,))
+        if lo > 0 and self.sorted_ranges[lo - 1][1] >= start:
+            lo -= 1
+        hi = self.sorted_ranges.bisect_left((end + 1,))
+        return lo, hi
+
+    def add(self, start: int, end: int) -> None:
+        """Adds the IDs start up to and including end
+
+        :param start: first ID
+        :type start: int
+        :param end: last ID
+        :type end: int
+        """
+        if start > end:
+            raise ValueError(f'Invalid range {start}-{end}')
+
+        # Ranges ending at start - 1 or later, and starting at end + 1 or earlier get swallowed
+        lo, hi = self._affected(start - 1, end + 1)
+
+        if lo < hi:
+            swallowed = list(self.sorted_ranges.islice(lo, hi))
+            start = min(start, swallowed[0][0])
+            end = max(end, swallowed[-1][1])
+            self.count -= sum(e - s + 1 for s, e in swallowed)
+            del self.sorted_ranges[lo:hi]
+
+        self.sorted_ranges.add((start, end))
+        self.count += end - start + 1
+
+        logger.debug(f"Added {start}-{end}, {self.count} IDs in {len(self.sorted_ranges)} ranges")
+
+    def remove(self, start: int, end: int) -> None:
+        """Removes the IDs start up to and including end
+
+        :param start: first ID
+        :type start: int
+        :param end: last ID
+        :type end: int
+        """
+        if start > end:
+            raise ValueError(f'Invalid range {start}-{end}')
+
+        # Ranges ending at start or later, and starting at end or earlier are affected
+        lo, hi = self._affected(start, end)
+        if lo >= hi:
+            return
+
+        affected = list(self.sorted_ranges.islice(lo, hi))
+        self.count -= sum(e - s + 1 for s, e in affected)
+        del self.sorted_ranges[lo:hi]
+
+        # Keep the parts sticking out on either side
+        if affected[0][0] < start:
+            self.sorted_ranges.add((affected[0][0], start - 1))
+            self.count += start - affected[0][0]
+        if affected[-1][1] > end:
+            self.sorted_ranges.add((end + 1, affected[-1][1]))
+            self.count += affected[-1][1] - end
+
+        logger.debug(f"Removed {start}-{end}, {self.count} IDs in {len(self.sorted_ranges)} ranges")
+
+    def __contains__(self, ingredient_ID: int) -> bool:
+        lo, hi = self._affected(ingredient_ID, ingredient_ID)
+        return lo < hi
+
+    def ranges(self) -> list:
+        """Current ranges, in the same format as the puzzle input
+
+        :return: sorted, non-overlapping ranges
+        :rtype: list
+        """
+        return [[start, end] for start, end in self.sorted_ranges]
+
+
+def spill_runs(filename: Path, tmp_dir: Path, run_size: int) -> tuple[list, list]:
+    """First stage of part_external: reads the input line by line, and writes sorted "runs"
+    of at most run_size ranges or IDs to binary files (int64).
+
+    :param filename: filename to read
+    :type filename: Path
+    :param tmp_dir: directory for the run files
+    :type tmp_dir: Path
+    :param run_size: amount of ranges or IDs per run
+    :type run_size: int
+    :return: run files for the ranges, and for the IDs
+    :rtype: tuple[list, list]
+    """
+    range_runs, ID_runs = [], []
+
+    def spill(buffer, runs, name):
+        data = np.array(buffer, dtype=np.int64)
+        if data.ndim == 2:
+            # Sort ranges on start, then end
+            data = data[np.lexsort((data[:, 1], data[:, 0]))]
+        else:
+            data.sort()
+
+        path = tmp_dir / f'{name}_{len(runs)}.bin'
+        data.tofile(path)
+        runs.append(path)
+        buffer.clear()
+
+    buffer = []
+    ID_switch = False
+    with open(filename, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line == "":
+                if not ID_switch and buffer:
+                    spill(buffer, range_runs, 'ranges')
+                ID_switch = True
+                continue
+
+            if not ID_switch:
+                buffer.append([int(i) for i in line.split('-')])
+            else:
+                buffer.append(int(line))
+
+            if len(buffer) >= run_size:
+                spill(buffer, ID_runs if ID_switch else range_runs, 'IDs' if ID_switch else 'ranges')
+
+    if buffer:
+        spill(buffer, ID_runs if ID_switch else range_runs, 'IDs' if ID_switch else 'ranges')
+
+    return range_runs, ID_runs
+
+
+def read_run(path: Path, width: int, chunk_size: int):
+    """Reads a run file back, a chunk at a time
+
+    :param path: run file
+    :type path: Path
+    :param width: values per item: 2 for ranges, 1 for IDs
+    :type width: int
+    :param chunk_size: amount of items to read at once
+    :type chunk_size: int
+    :yield: (start, end) ranges or IDs
+    :rtype: Iterator
+    """
+    with open(path, "rb") as f:
+        while len(data := np.fromfile(f, dtype=np.int64, count=chunk_size * width)):
+            if width == 1:
+                yield from data.tolist()
+            else:
+                yield from map(tuple, data.reshape(-1, width).tolist())
+
+
+def merge_range_runs(range_runs: list, chunk_size: int):
+    """Merges the sorted runs of ranges (k-way merge), and combines overlapping ranges on the fly,
+    just like merge_ranges.
+
+    :param range_runs: run files with ranges
+    :type range_runs: list
+    :param chunk_size: amount of ranges to read at once, per run
+    :type chunk_size: int
+    :yield: combined (start, end) ranges, sorted
+    :rtype: Iterator[tuple[int, int]]
+    """
+    last_range = None
+    for start, end in heapq.merge(*[read_run(path, 2, chunk_size) for path in range_runs]):
+        if last_range is not None and start <= last_range[1]:
+            last_range = (last_range[0], max(last_range[1], end))
+        else:
+            if last_range is not None:
+                yield last_range
+            last_range = (start, end)
+
+    if last_range is not None:
+        yield last_range
+
+
+def write_run(items, path: Path, chunk_size: int) -> None:
+    """Writes sorted ranges or IDs to a run file (int64), a chunk at a time
+
+    :param items: (start, end) ranges or IDs
+    :type items: Iterator
+    :param path: run file
+    :type path: Path
+    :param chunk_size: amount of items to write at once
+    :type chunk_size: int
+    """
+    items = iter(items)
+    with open(path, "wb") as f:
+        while chunk := list(islice(items, chunk_size)):
+            np.array(chunk, dtype=np.int64).tofile(f)
+
+
+def reduce_runs(runs: list, width: int, chunk_size: int, max_runs: int) -> list:
+    """Merges runs, max_runs at a time, into new (longer) runs, until at most max_runs are left.
+    Keeps the amount of open files and read buffers limited, whatever the amount of runs.
+    Ranges are combined while merging (merge_range_runs), so the runs get shorter as well.
+
+    :param runs: run files
+    :type runs: list
+    :param width: values per item: 2 for ranges, 1 for IDs
+    :type width: int
+    :param chunk_size: amount of items to read at once, per run
+    :type chunk_size: int
+    :param max_runs: amount of runs to merge at the same time (at least 2)
+    :type max_runs: int
+    :return: at most max_runs run files
+    :rtype: list
+    """
+    merge_pass = 0
+    while len(runs) > max_runs:
+        merged = []
+        for i in range(0, len(runs), max_runs):
+            group = runs[i:i + max_runs]
+            if width == 2:
+                items = merge_range_runs(group, chunk_size)
+            else:
+                items = heapq.merge(*[read_run(path, 1, chunk_size) for path in group])
+
+            path = group[0].with_name(f'{group[0].stem}_pass{merge_pass}_{len(merged)}.bin')
+            write_run(items, path, chunk_size)
+            merged.append(path)
+
+            for old_path in group:
+                old_path.unlink()
+
+        logger.debug(f"Merge pass {merge_pass}: {len(runs)} runs into {len(merged)}")
+        runs = merged
+        merge_pass += 1
+
+    return runs
+
+
+def part_external(filename: Path, run_size: int = 1_000_000, chunk_size: int = 1 << 16,
+                  max_runs: int = 32) -> tuple[int, int]:
+    """Both parts, for input files that don't fit in memory (external sort).
+
+    - Read the file, writing sorted runs of ranges and IDs to temporary files (spill_runs)
+    - When there are more than max_runs runs, merge them in extra passes first (reduce_runs)
+    - Merge the runs of ranges, combining overlapping ranges on the fly (merge_range_runs)
+    - Merge the runs of IDs, and walk through IDs and combined ranges at the same time:
+      as both are sorted, a range can be skipped once an ID is past its end.
+
+    At most max_runs runs of ranges and max_runs runs of IDs are read at the same time,
+    each with a buffer of chunk_size items. So memory use and open files depend on
+    run_size, chunk_size and max_runs, not on the file size; a bigger file means more merge passes.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param run_size: amount of ranges or IDs per run
+    :type run_size: int
+    :param chunk_size: amount of items to read at once, per run
+    :type chunk_size: int
+    :param max_runs: amount of runs to merge at the same time (at least 2)
+    :type max_runs: int
+    :return: amount of valid IDs (part 1) and the number of IDs in the combined ranges (part 2)
+    :rtype: tuple[int, int]
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        range_runs, ID_runs = spill_runs(filename, Path(tmp), run_size)
+        logger.debug(f"Spilled {len(range_runs)} runs of ranges and {len(ID_runs)} runs of IDs")
+        range_runs = reduce_runs(range_runs, 2, chunk_size, max_runs)
+        ID_runs = reduce_runs(ID_runs, 1, chunk_size, max_runs)
+
+        combined_ranges = merge_range_runs(range_runs, chunk_size)
+        IDs = heapq.merge(*[read_run(path, 1, chunk_size) for path in ID_runs])
+
+        valid_IDs = 0
+        total_IDs = 0
+
+        current = next(combined_ranges, None)
+        if current is not None:
+            total_IDs += current[1] - current[0] + 1
+
+        for ingredient_ID in IDs:
+            # Skip the ranges ending before this ID
+            while current is not None and current[1] < ingredient_ID:
+                current = next(combined_ranges, None)
+                if current is not None:
+                    total_IDs += current[1] - current[0] + 1
+
+            if current is None:
+                break
+
+            if current[0] <= ingredient_ID:
+                valid_IDs += 1
+
+        # Count the ranges after the last ID
+        for start, end in combined_ranges:
+            total_IDs += end - start + 1
+
+    logger.info(f"Valid IDs: {valid_IDs}, total number of valid IDs in combined ranges: {total_IDs}")
+
+    return valid_IDs, total_IDs
+
+
 if __name__ == "__main__":  # pragma: no cover
     # fresh_ID_ranges, available_IDs = read_input(Path("05/sample01.txt"))
     fresh_ID_ranges, available_IDs = read_input(Path("05/input.txt"))
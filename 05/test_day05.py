@@ -1,5 +1,7 @@
 from pathlib import Path
-from day05 import read_input, check_ID, part1, part2
+from day05 import read_input, check_ID, part1, part2, merge_ranges, IntervalIndex, part1_numpy, IntervalSet
+from day05 import part_external
+import random
 import pytest
 
 
@@ -29,3 +31,116 @@ def test_part1(puzzle):
 
 def test_part2(puzzle):
     assert part2(puzzle[0]) == 14
+
+
+@pytest.mark.parametrize("id_value, expected", cases.items())
+def test_interval_index(puzzle, id_value, expected):
+    assert (id_value in IntervalIndex(puzzle[0])) is expected
+
+
+def test_merge_ranges(puzzle):
+    assert merge_ranges(puzzle[0]) == [[3, 5], [10, 20]]
+    assert merge_ranges([]) == []
+
+
+def test_interval_index_random():
+    random.seed(19)
+    ranges = [[start, start + random.randint(0, 20)] for start in random.sample(range(1000), 50)]
+    index = IntervalIndex(ranges)
+    for ingredient_ID in range(-5, 1030):
+        assert (ingredient_ID in index) is check_ID(ingredient_ID, ranges)
+
+
+def test_part1_numpy(puzzle):
+    assert part1_numpy(puzzle[0], puzzle[1]) == 3
+
+    count, mask = part1_numpy(puzzle[0], puzzle[1], return_mask=True)
+    assert count == 3
+    assert mask.tolist() == [cases[i] for i in puzzle[1]]
+
+
+def test_part1_numpy_random():
+    random.seed(20)
+    ranges = [[start, start + random.randint(0, 20)] for start in random.sample(range(1000), 50)]
+    ids = [random.randint(-5, 1030) for _ in range(2000)]
+    assert part1_numpy(ranges, ids) == part1(ranges, ids)
+    assert part1_numpy([], ids) == 0
+
+
+def test_interval_set_sample(puzzle):
+    fresh = IntervalSet(puzzle[0])
+    assert fresh.count == part2(puzzle[0]) == 14
+    assert [i in fresh for i in cases] == list(cases.values())
+
+
+def test_interval_set_split():
+    fresh = IntervalSet([[10, 20]])
+    fresh.remove(13, 15)
+    assert fresh.ranges() == [[10, 12], [16, 20]]
+    assert fresh.count == 8
+
+    fresh.add(12, 16)
+    assert fresh.ranges() == [[10, 20]]
+    assert fresh.count == 11
+
+    with pytest.raises(ValueError):
+        fresh.add(5, 4)
+
+
+def test_interval_set_bulk_load():
+    # Overlapping and touching ranges are combined when building
+    fresh = IntervalSet([[10, 12], [1, 3], [4, 6], [11, 15]])
+    assert fresh.ranges() == [[1, 6], [10, 15]]
+    assert fresh.count == 12
+
+    with pytest.raises(ValueError):
+        IntervalSet([[1, 3], [5, 4]])
+
+
+def test_interval_set_random():
+    random.seed(21)
+    fresh = IntervalSet()
+    expected = set()
+
+    for _ in range(500):
+        start = random.randint(0, 300)
+        end = start + random.randint(0, 30)
+        if random.random() < 0.6:
+            fresh.add(start, end)
+            expected |= set(range(start, end + 1))
+        else:
+            fresh.remove(start, end)
+            expected -= set(range(start, end + 1))
+
+        assert fresh.count == len(expected) == part2(fresh.ranges())
+
+    assert {i for i in range(-1, 340) if i in fresh} == expected
+
+
+def test_part_external_sample():
+    assert part_external(Path("05/sample01.txt")) == (3, 14)
+
+
+@pytest.mark.parametrize("run_size", [1, 3, 1000])
+def test_part_external_runs(tmp_path, run_size):
+    random.seed(22)
+    ranges = [[start, start + random.randint(0, 20)] for start in random.sample(range(1000), 50)]
+    ids = [random.randint(-5, 1030) for _ in range(300)]
+
+    filename = tmp_path / 'input.txt'
+    filename.write_text('\n'.join(f'{start}-{end}' for start, end in ranges) + '\n\n' + '\n'.join(map(str, ids)))
+
+    assert part_external(filename, run_size=run_size, chunk_size=7) == (part1(ranges, ids), part2(ranges))
+
+
+@pytest.mark.parametrize("max_runs", [2, 3])
+def test_part_external_merge_passes(tmp_path, max_runs):
+    # 1 item per run: 50 runs of ranges and 300 runs of IDs, merged a few at a time
+    random.seed(23)
+    ranges = [[start, start + random.randint(0, 20)] for start in random.sample(range(1000), 50)]
+    ids = [random.randint(-5, 1030) for _ in range(300)]
+
+    filename = tmp_path / 'input.txt'
+    filename.write_text('\n'.join(f'{start}-{end}' for start, end in ranges) + '\n\n' + '\n'.join(map(str, ids)))
+
+    assert part_external(filename, run_size=1, chunk_size=7, max_runs=max_runs) == (part1(ranges, ids), part2(ranges))
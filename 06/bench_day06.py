@@ -0,0 +1,106 @@
+from pathlib import Path
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import coloredlogs
+import numpy as np
+import day06
+from day06 import (
+    evaluate, evaluate_balanced, iter_problems, part1, part2, read_input, solve, solve_numpy, solve_parallel)
+
+coloredlogs.install(level='INFO')
+logger = logging.getLogger(__name__)
+
+logging.getLogger(day06.__name__).setLevel(logging.WARNING)
+# part1 formats its (huge) answers for the debug log, even when not shown
+sys.set_int_max_str_digits(0)
+
+
+def generate_worksheet(filename: Path, problems: int, operands: int, max_width: int = 18) -> None:
+    """Writes a random worksheet with big numbers, so lots of operands per problem
+
+    :param filename: filename to write
+    :type filename: Path
+    :param problems: amount of problems
+    :type problems: int
+    :param operands: amount of numbers per problem (lines)
+    :type operands: int
+    :param max_width: most digits of a number
+    :type max_width: int
+    """
+    random.seed(2025)
+    columns = []
+    for _ in range(problems):
+        width = random.randint(1, max_width)
+        # All numbers of a problem the same width: part2 can't handle gaps within a column
+        numbers = [str(random.randint(10 ** (width - 1), 10 ** width - 1)) for _ in range(operands)]
+        columns.append(numbers + [random.choice('+*').ljust(width)])
+
+    with open(filename, "w") as f:
+        for row in range(operands + 1):
+            f.write(' '.join(column[row] for column in columns) + '\n')
+
+
+def timed(label: str, operands: int, func, *args):
+    """Runs func and logs the operands per second, returns what func returns.
+    Answers can be huge, so only their hash is logged.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    logger.info(f'{label:<32} {duration:8.3f} s {operands / duration / 1e3:10.2f} k operands/s  -> {hash(result)}')
+    return result
+
+
+def bench_parse(problems: int = 100_000, operands: int = 4) -> None:
+    # Lots of small problems, like the puzzle input: mostly reading the file
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = Path(tmp) / 'homework.txt'
+        generate_worksheet(filename, problems, operands, max_width=4)
+
+        expected = timed('read_input + part1, part2', problems * operands,
+                         lambda: (part1(read_input(filename)), part2(filename)))
+        assert timed('solve', problems * operands, solve, filename) == expected
+        assert timed('solve_numpy', problems * operands, solve_numpy, filename) == expected
+
+
+def bench_evaluate(problems: int = 40, operands: int = 3000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = Path(tmp) / 'homework.txt'
+        generate_worksheet(filename, problems, operands)
+
+        total1 = timed('part1', problems * operands, lambda: part1(read_input(filename)))
+        total2 = timed('part2', problems * operands, part2, filename)
+        assert timed('solve', problems * operands, solve, filename) == (total1, total2)
+        for processes in range(1, os.cpu_count() + 1):
+            assert timed(f'solve_parallel {processes} cores', problems * operands,
+                         solve_parallel, filename, processes) == (total1, total2)
+
+
+def bench_products(problems: int = 40, operands: int = 20000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = Path(tmp) / 'homework.txt'
+        generate_worksheet(filename, problems, operands)
+        parsed = list(iter_problems(filename))
+
+    # Time + and * on their own, as they take a different route
+    for operator in '+*':
+        numbers_list = [numbers for problem_operator, numbers, _ in parsed if problem_operator == operator]
+        arrays = [np.array(numbers, dtype=np.int64) for numbers in numbers_list]
+        amount = len(numbers_list) * operands
+
+        expected = timed(f'evaluate {operator}', amount,
+                         lambda: sum(evaluate(operator, numbers) for numbers in numbers_list))
+        assert timed(f'evaluate_balanced {operator}', amount,
+                     lambda: sum(evaluate_balanced(operator, numbers) for numbers in numbers_list)) == expected
+        assert timed(f'evaluate_balanced {operator} (arrays)', amount,
+                     lambda: sum(evaluate_balanced(operator, numbers) for numbers in arrays)) == expected
+
+
+if __name__ == "__main__":  # pragma: no cover
+    bench_parse()
+    bench_evaluate()
+    bench_products()
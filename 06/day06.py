@@ -1,7 +1,12 @@
 from pathlib import Path
 import logging
 import coloredlogs
+import heapq
 import math
+import mmap
+import multiprocessing
+import os
+import numpy as np
 
 
 coloredlogs.install(level='INFO')
@@ -130,6 +135,352 @@ def part2(filename) -> int:
     return total
 
 
+def evaluate(operator: str, numbers: list) -> int:
+    """Answer of a single problem
+
+    :param operator: + or *
+    :type operator: str
+    :param numbers: numbers of the problem
+    :type numbers: list
+    :return: answer
+    :rtype: int
+    """
+    if operator == "*":
+        return math.prod(numbers)
+    return sum(numbers)
+
+
+def iter_problems(filename: Path):
+    """Finds all problems in a single pass over the lines of the memory-mapped homework file.
+
+    Every line is handled at once with NumPy, no Python loop per character:
+    the columns with a digit (or operator) are collected, and each column's number (part 2)
+    gets the digits of the line added, like 10 * number + digit. The row numbers (part 1) are
+    the words of the line, remembered with the column they start in.
+    After the last line, the columns with only spaces split the problems, and the row numbers
+    are divided over the problems by their start column.
+
+    :param filename: filename to read
+    :type filename: Path
+    :yield: operator, row numbers (part 1) and column numbers (part 2) of each problem
+    :rtype: Iterator[tuple[str, list, list]]
+    """
+    with open(filename, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        data = np.frombuffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), dtype=np.uint8)
+
+    # Find the lines (without newline characters)
+    newlines = np.flatnonzero(data == ord('\n'))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(data)]))
+    ends -= (ends > starts) & (data[np.maximum(ends - 1, 0)] == ord('\r'))
+    lines = list(zip(starts.tolist(), ends.tolist()))
+
+    # Skip empty lines at the end
+    while lines and lines[-1][0] == lines[-1][1]:
+        lines.pop()
+    if not lines:
+        return
+
+    *number_lines, (op_start, op_end) = lines
+    width = max(end - start for start, end in lines)
+
+    # Column numbers can get more digits than an int64 holds when there are many lines
+    column_numbers = np.zeros(width, dtype=np.int64 if len(number_lines) <= 18 else object)
+    has_digit = np.zeros(width, dtype=bool)
+    words = []
+    for start, end in number_lines:
+        line = data[start:end]
+        is_digit = line != ord(' ')
+
+        numbers = column_numbers[:len(line)]
+        column_numbers[:len(line)] = np.where(is_digit, 10 * numbers + (line.astype(np.int64) - ord('0')), numbers)
+        has_digit[:len(line)] |= is_digit
+
+        word_starts = np.flatnonzero(is_digit & ~np.concatenate(([False], is_digit[:-1])))
+        words.append((word_starts, line.tobytes().split()))
+
+    # Operator line, padded, plus an extra empty column so the last problem ends as well
+    operators = np.full(width + 1, ord(' '), dtype=np.uint8)
+    operators[:op_end - op_start] = data[op_start:op_end]
+    used = np.append(has_digit, False) | (operators != ord(' '))
+
+    edges = np.diff(np.concatenate(([0], used.astype(np.int8))))
+    problem_starts = np.flatnonzero(edges == 1)
+    problem_ends = np.flatnonzero(edges == -1)
+    problem_operators = np.maximum.reduceat(operators, problem_starts).tolist()
+
+    row_numbers = [[] for _ in problem_starts]
+    for word_starts, line_words in words:
+        problems = np.searchsorted(problem_starts, word_starts, side='right') - 1
+        for problem, word in zip(problems.tolist(), line_words):
+            row_numbers[problem].append(int(word))
+
+    for problem, (start, end) in enumerate(zip(problem_starts.tolist(), problem_ends.tolist())):
+        yield (chr(problem_operators[problem]), row_numbers[problem],
+               column_numbers[start:end][has_digit[start:end]].tolist())
+
+
+def solve(filename: Path) -> tuple[int, int]:
+    """Both parts at once, from a single pass over the homework file (see iter_problems)
+
+    :param filename: filename to read
+    :type filename: Path
+    :return: total of part 1 and part 2
+    :rtype: tuple[int, int]
+    """
+    total1, total2 = 0, 0
+    for operator, row_numbers, column_numbers in iter_problems(filename):
+        total1 += evaluate(operator, row_numbers)
+        total2 += evaluate(operator, column_numbers)
+
+    logger.info(f"Total part 1: {total1}, total part 2: {total2}")
+
+    return total1, total2
+
+
+def read_worksheet(filename: Path) -> np.ndarray:
+    """Reads the homework file as a matrix of characters (bytes), padded with spaces
+
+    :param filename: filename to read
+    :type filename: Path
+    :return: characters, one row per line
+    :rtype: np.ndarray
+    """
+    with open(filename, "rb") as f:
+        lines = [line.rstrip(b'\r\n') for line in f]
+
+    # Skip empty lines at the end
+    while lines and not lines[-1].strip():
+        lines.pop()
+
+    worksheet = np.full((len(lines), max((len(line) for line in lines), default=0)), ord(' '), dtype=np.uint8)
+    for i, line in enumerate(lines):
+        worksheet[i, :len(line)] = np.frombuffer(line, dtype=np.uint8)
+
+    return worksheet
+
+
+def decode_worksheet(worksheet: np.ndarray) -> tuple[list, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Decodes all numbers of the worksheet at once, with NumPy
+
+    Columns with only spaces separate the problems. A number is the sum of its digits
+    times a power of ten, the power being the amount of digits after it. For a column number (part 2)
+    that's the digits below it in the column, for a row number (part 1) the digits to the right of it
+    within the same problem. Both are counted with a (reversed) cumulative sum over the digit mask.
+    Numbers are int64, unless one has more than 18 digits: then all are Python ints.
+
+    :param worksheet: characters, see read_worksheet
+    :type worksheet: np.ndarray
+    :return: operators, row numbers (row x problem), which rows have a number per problem,
+        column numbers and which columns have a number
+    :rtype: tuple[list, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    """
+    numbers, operators = worksheet[:-1], worksheet[-1]
+    height, width = numbers.shape
+
+    is_digit = numbers != ord(' ')
+    digits = np.where(is_digit, numbers.astype(np.int64) - ord('0'), 0)
+
+    # Problems: runs of columns which are not all spaces
+    separator = (worksheet == ord(' ')).all(axis=0)
+    edges = np.diff(np.concatenate(([1], separator.astype(np.int8), [1])))
+    problem_starts = np.flatnonzero(edges == -1)
+    problem_ends = np.flatnonzero(edges == 1)
+
+    # Column numbers: digits below
+    below = np.cumsum(is_digit[::-1], axis=0)[::-1] - is_digit
+
+    # Row numbers: digits to the right, up to the end of the problem
+    from_right = np.zeros((height, width + 1), dtype=np.int64)
+    from_right[:, :width] = np.cumsum(is_digit[:, ::-1], axis=1)[:, ::-1]
+    problem_end = np.zeros(width, dtype=np.int64)
+    problem_end[np.concatenate(([0], problem_ends[:-1]))] = np.diff(np.concatenate(([0], problem_ends)))
+    problem_end = np.cumsum(problem_end)
+    right = np.where(is_digit, from_right[:, :width] - from_right[:, problem_end] - is_digit, 0)
+
+    # Numbers of more than 18 digits don't fit in an int64, use Python ints for those (a lot slower)
+    places = max(int(below.max(initial=0)), int(right.max(initial=0))) + 1
+    if places <= 18:
+        powers = 10 ** np.arange(places, dtype=np.int64)
+    else:
+        powers = np.array([10 ** place for place in range(places)], dtype=object)
+        digits = digits.astype(object)
+
+    column_numbers = (digits * powers[below]).sum(axis=0)
+    column_has_number = is_digit.any(axis=0)
+
+    row_numbers = np.add.reduceat(digits * powers[right], problem_starts, axis=1)
+    row_has_number = np.logical_or.reduceat(is_digit, problem_starts, axis=1)
+
+    # Operator: the highest character of the problem in the last line (+ and * beat spaces)
+    problem_operators = [chr(op) for op in np.maximum.reduceat(operators, problem_starts).tolist()]
+
+    problems = list(zip(problem_starts.tolist(), problem_ends.tolist()))
+    return (problem_operators, row_numbers, row_has_number,
+            [column_numbers[start:end] for start, end in problems],
+            [column_has_number[start:end] for start, end in problems])
+
+
+def solve_numpy(filename: Path) -> tuple[int, int]:
+    """Both parts at once, decoding the worksheet with NumPy (see decode_worksheet).
+    Only adding up or multiplying the numbers is done per problem, by evaluate_balanced:
+    the decoded numbers are arrays already, so + is summed in NumPy when it can't overflow.
+
+    :param filename: filename to read
+    :type filename: Path
+    :return: total of part 1 and part 2
+    :rtype: tuple[int, int]
+    """
+    worksheet = read_worksheet(filename)
+    if worksheet.size == 0:
+        return 0, 0
+    operators, row_numbers, row_has_number, column_numbers, column_has_number = decode_worksheet(worksheet)
+
+    total1, total2 = 0, 0
+    for p, operator in enumerate(operators):
+        total1 += evaluate_balanced(operator, row_numbers[row_has_number[:, p], p])
+        total2 += evaluate_balanced(operator, column_numbers[p][column_has_number[p]])
+
+    logger.info(f"Total part 1: {total1}, total part 2: {total2}")
+
+    return total1, total2
+
+
+def balanced_prod(numbers: list) -> int:
+    """Product of numbers, multiplying pairs of similar size (product tree).
+
+    math.prod multiplies left to right, so every step multiplies an ever growing number
+    by a small one. Multiplying in pairs keeps both sides about the same size, which is
+    a lot faster for thousands of big numbers.
+
+    :param numbers: numbers to multiply
+    :type numbers: list
+    :return: product, 1 if there are no numbers
+    :rtype: int
+    """
+    numbers = list(numbers)
+    while len(numbers) > 1:
+        pairs = [a * b for a, b in zip(numbers[::2], numbers[1::2])]
+        if len(numbers) % 2:
+            pairs.append(numbers[-1])
+        numbers = pairs
+
+    return numbers[0] if numbers else 1
+
+
+# Amount of numbers from where evaluate_balanced is faster than evaluate
+SMALL_PROBLEM = 64
+
+
+def evaluate_balanced(operator: str, numbers: list) -> int:
+    """Same as evaluate, but for big problems: multiplies with balanced_prod. Numbers
+    that are already in an int64 array (like from decode_worksheet) are added up with NumPy,
+    when the sum can not overflow. Converting a list to an array first is slower than sum().
+    Small problems just go to evaluate, NumPy and the product tree don't pay off for those.
+
+    :param operator: + or *
+    :type operator: str
+    :param numbers: numbers of the problem (not negative)
+    :type numbers: list | np.ndarray
+    :return: answer
+    :rtype: int
+    """
+    if len(numbers) < SMALL_PROBLEM:
+        return evaluate(operator, numbers.tolist() if isinstance(numbers, np.ndarray) else numbers)
+
+    if isinstance(numbers, np.ndarray):
+        if operator == "+" and numbers.dtype == np.int64 and len(numbers) * int(numbers.max(initial=0)) < 2 ** 63:
+            return int(numbers.sum())
+        numbers = numbers.tolist()
+
+    if operator == "*":
+        return balanced_prod(numbers)
+    return sum(numbers)
+
+
+def problem_size(numbers: list) -> int:
+    """Rough amount of work of a problem: total amount of bits of its numbers
+
+    :param numbers: numbers of the problem
+    :type numbers: list
+    :return: size
+    :rtype: int
+    """
+    return sum(n.bit_length() for n in numbers) + 1
+
+
+def balance_batches(tasks: list, batches: int) -> list:
+    """Divides the tasks over batches of about the same size, largest first,
+    each one going into the batch with the least work so far (LPT)
+
+    :param tasks: (part, operator, numbers) tasks
+    :type tasks: list
+    :param batches: amount of batches
+    :type batches: int
+    :return: batches of tasks, empty batches left out
+    :rtype: list
+    """
+    heap = [(0, i, []) for i in range(batches)]
+    for task in sorted(tasks, key=lambda task: problem_size(task[2]), reverse=True):
+        size, i, batch = heapq.heappop(heap)
+        batch.append(task)
+        heapq.heappush(heap, (size + problem_size(task[2]), i, batch))
+
+    return [batch for _, _, batch in sorted(heap, key=lambda item: item[1]) if batch]
+
+
+def evaluate_batch(batch: list) -> tuple[int, int]:
+    """Worker for solve_parallel: evaluates a batch of tasks
+
+    :param batch: (part, operator, numbers) tasks
+    :type batch: list
+    :return: total of part 1 and part 2 of this batch
+    :rtype: tuple[int, int]
+    """
+    totals = [0, 0]
+    for part, operator, numbers in batch:
+        totals[part - 1] += evaluate_balanced(operator, numbers)
+
+    return totals[0], totals[1]
+
+
+def solve_parallel(filename: Path, processes: int | None = None, batches: int | None = None) -> tuple[int, int]:
+    """Both parts at once (like solve), with the problems spread over multiple processes.
+
+    Each problem is evaluated twice (row and column numbers), these are the tasks. They
+    are divided into batches of about the same amount of work (see balance_batches), so
+    one huge problem does not keep a single process busy while the others are waiting.
+
+    :param filename: filename to read
+    :type filename: Path
+    :param processes: amount of processes, defaults to cpu count
+    :type processes: int | None
+    :param batches: amount of batches, defaults to 4 per process
+    :type batches: int | None
+    :return: total of part 1 and part 2
+    :rtype: tuple[int, int]
+    """
+    processes = processes or os.cpu_count()
+    batches = batches or 4 * processes
+
+    tasks = []
+    for operator, row_numbers, column_numbers in iter_problems(filename):
+        tasks.append((1, operator, row_numbers))
+        tasks.append((2, operator, column_numbers))
+
+    total1, total2 = 0, 0
+    with multiprocessing.Pool(processes=processes) as pool:
+        for batch_total1, batch_total2 in pool.imap_unordered(evaluate_batch, balance_batches(tasks, batches)):
+            total1 += batch_total1
+            total2 += batch_total2
+
+    logger.info(f"Total part 1: {total1}, total part 2: {total2}")
+
+    return total1, total2
+
+
 if __name__ == "__main__":  # pragma: no cover
     # filename = Path("06/sample01.txt")
     filename = Path("06/input.txt")
@@ -1,6 +1,10 @@
 from pathlib import Path
-from day06 import read_input, part1, part2
+from day06 import (
+    balance_batches, balanced_prod, decode_worksheet, evaluate_balanced, iter_problems, part1, part2, read_input,
+    read_worksheet, solve, solve_numpy, solve_parallel)
 import pytest
+import numpy as np
+import math
 
 
 @pytest.fixture
@@ -14,3 +18,146 @@ def test_part1(puzzle):
 
 def test_part2(puzzle):
     assert part2(Path("06/sample01.txt")) == 3263827
+
+
+def test_iter_problems():
+    problems = list(iter_problems(Path("06/sample01.txt")))
+    assert problems[0] == ('*', [123, 45, 6], [1, 24, 356])
+    assert problems[-1] == ('+', [64, 23, 314], [623, 431, 4])
+
+
+def test_solve(puzzle):
+    assert solve(Path("06/sample01.txt")) == (part1(puzzle), part2(Path("06/sample01.txt")))
+
+
+def test_solve_ragged(tmp_path):
+    # Lines not padded to the same width, and windows line endings
+    filename = tmp_path / 'homework.txt'
+    filename.write_bytes(b'12 3\r\n 4 56\r\n+  *\r\n')
+    assert list(iter_problems(filename)) == [('+', [12, 4], [1, 24]), ('*', [3, 56], [35, 6])]
+    assert solve(filename) == (12 + 4 + 3 * 56, 1 + 24 + 35 * 6)
+
+
+@pytest.mark.parametrize("content", [b'', b'\n\n'])
+def test_iter_problems_empty(tmp_path, content):
+    filename = tmp_path / 'homework.txt'
+    filename.write_bytes(content)
+    assert list(iter_problems(filename)) == []
+
+
+def test_iter_problems_many_lines(tmp_path):
+    # Column numbers of 25 digits don't fit in an int64
+    filename = tmp_path / 'homework.txt'
+    filename.write_text('12\n' * 25 + '+ \n')
+    assert list(iter_problems(filename)) == [('+', [12] * 25, [int('1' * 25), int('2' * 25)])]
+
+
+def test_read_worksheet(tmp_path):
+    filename = tmp_path / 'homework.txt'
+    filename.write_bytes(b'12 3\r\n 4 56\r\n+  *\r\n\n')
+    assert [bytes(row) for row in read_worksheet(filename)] == [b'12 3 ', b' 4 56', b'+  * ']
+
+
+def test_decode_worksheet():
+    operators, row_numbers, row_has_number, column_numbers, column_has_number = decode_worksheet(
+        read_worksheet(Path("06/sample01.txt")))
+    assert operators == ['*', '+', '*', '+']
+    assert row_numbers[:, 0].tolist() == [123, 45, 6]
+    assert row_has_number.all()
+    assert column_numbers[0].tolist() == [1, 24, 356]
+    assert column_numbers[3].tolist() == [623, 431, 4]
+
+
+def test_solve_numpy():
+    assert solve_numpy(Path("06/sample01.txt")) == (4277556, 3263827)
+
+
+@pytest.mark.parametrize("content", [b'', b'\n\n'])
+def test_solve_numpy_empty(tmp_path, content):
+    filename = tmp_path / 'homework.txt'
+    filename.write_bytes(content)
+    assert solve_numpy(filename) == (0, 0)
+
+
+def test_solve_numpy_long_number(tmp_path):
+    # 19 digits don't fit in an int64
+    filename = tmp_path / 'homework.txt'
+    filename.write_text('9999999999999999999 1\n1                   2\n+                   *\n')
+    assert solve_numpy(filename) == solve(filename) == (10 ** 19 + 2, 265)
+
+
+def test_solve_numpy_many_lines(tmp_path):
+    # Column numbers of 25 digits
+    filename = tmp_path / 'homework.txt'
+    filename.write_text('1\n' * 25 + '+\n')
+    assert solve_numpy(filename) == solve(filename) == (25, int('1' * 25))
+
+
+def test_solve_numpy_ragged(tmp_path):
+    filename = tmp_path / 'homework.txt'
+    filename.write_bytes(b'12 3\r\n 4 56\r\n+  *\r\n')
+    assert solve_numpy(filename) == solve(filename)
+
+
+def test_solve_numpy_random(tmp_path):
+    # Compare against the mmap parser on a random worksheet with uneven numbers
+    random = np.random.default_rng(6)
+    columns = []
+    for _ in range(50):
+        numbers = [str(n) for n in random.integers(1, 10 ** random.integers(1, 6, size=4))]
+        width = max(len(n) for n in numbers)
+        align = str.ljust if random.integers(2) else str.rjust
+        columns.append([align(n, width) for n in numbers] + [random.choice(['+', '*']).ljust(width)])
+    filename = tmp_path / 'homework.txt'
+    filename.write_text('\n'.join(' '.join(column[row] for column in columns) for row in range(5)) + '\n')
+    assert solve_numpy(filename) == solve(filename)
+
+
+def test_balanced_prod():
+    assert balanced_prod([]) == 1
+    assert balanced_prod([7]) == 7
+    assert balanced_prod(range(1, 20)) == math.prod(range(1, 20))
+
+
+def test_evaluate_balanced():
+    assert evaluate_balanced('*', [123, 45, 6]) == 33210
+    assert evaluate_balanced('+', [328, 64, 98]) == 490
+    assert evaluate_balanced('+', []) == 0
+    # Too big for int64, falls back to python ints
+    assert evaluate_balanced('+', [2 ** 62, 2 ** 62, 10 ** 30]) == 2 ** 63 + 10 ** 30
+
+
+def test_evaluate_balanced_array():
+    assert evaluate_balanced('+', np.array([328, 64, 98])) == 490
+    assert evaluate_balanced('+', np.array([], dtype=np.int64)) == 0
+    assert evaluate_balanced('*', np.array([123, 45, 6])) == 33210
+    # Sum and product would overflow as int64
+    assert evaluate_balanced('+', np.array([2 ** 62, 2 ** 62])) == 2 ** 63
+    assert evaluate_balanced('*', np.array([2 ** 40, 2 ** 40])) == 2 ** 80
+    # Big enough for the NumPy sum and the product tree
+    assert evaluate_balanced('+', np.arange(100)) == 4950
+    assert evaluate_balanced('+', np.full(100, 2 ** 60)) == 100 * 2 ** 60
+    assert evaluate_balanced('*', np.full(100, 3)) == 3 ** 100
+
+
+def test_solve_numpy_big_problems(tmp_path):
+    # 100 numbers per problem, so not evaluated as small problems
+    filename = tmp_path / 'homework.txt'
+    filename.write_text('12 345\n' * 100 + '+  * \n')
+    total1, total2 = solve_numpy(filename)
+    assert total1 == 1200 + 345 ** 100
+    assert total2 == int('1' * 100) + int('2' * 100) + int('3' * 100) * int('4' * 100) * int('5' * 100)
+    assert solve(filename) == (total1, total2)
+
+
+def test_balance_batches():
+    tasks = [(1, '+', [2 ** 100] * 3), (1, '+', [1]), (2, '*', [2 ** 100] * 2), (2, '*', [2 ** 100])]
+    batches = balance_batches(tasks, 2)
+    assert sorted(task for batch in batches for task in batch) == sorted(tasks)
+    # Largest first: 3 big numbers + the tiny one, against 2 + 1 big numbers
+    assert batches == [[tasks[0], tasks[1]], [tasks[2], tasks[3]]]
+    assert balance_batches(tasks, 10) == [[tasks[0]], [tasks[2]], [tasks[3]], [tasks[1]]]
+
+
+def test_solve_parallel():
+    assert solve_parallel(Path("06/sample01.txt"), processes=2) == (4277556, 3263827)